@@ -18,4 +18,39 @@ CORS_ORIGINS = [
 _default_cors_allow_all = "false" if APP_ENV in {"prod", "production"} else "true"
 CORS_ALLOW_ALL = os.getenv("CORS_ALLOW_ALL", _default_cors_allow_all).lower() == "true"
 
+# Intervalo (segundos) entre verificacoes de alteracao da planilha de catalogo.
+# Use 0 para desativar o recarregamento automatico.
+CATALOGO_RELOAD_INTERVAL = float(os.getenv("CATALOGO_RELOAD_INTERVAL", "5"))
+CATALOGO_VERSOES_RETIDAS = int(os.getenv("CATALOGO_VERSOES_RETIDAS", "4"))
 
+# Usa (e regrava) o catalogo compilado "orcamento_final.catalogo" ao lado da
+# planilha, validado pelo hash do xlsx. Gere com:
+#   python -m app.features.orcamento.catalogo.compilar
+CATALOGO_USAR_COMPILADO = os.getenv("CATALOGO_USAR_COMPILADO", "true").lower() == "true"
+
+# Backend das sessoes de conversa: "memory" (padrao, por processo) ou "sqlite"
+# (arquivo local compartilhado entre workers do mesmo host).
+SESSION_STORE = os.getenv("SESSION_STORE", "memory").lower()
+SESSION_DB_PATH = Path(os.getenv("SESSION_DB_PATH", str(BASE_DIR / "sessoes.db")))
+
+# Sessoes ociosas por mais de SESSION_TTL_SECONDS sao descartadas; acima de
+# SESSION_MAX_SESSIONS as menos usadas recentemente saem primeiro. 0 desativa.
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "7200"))
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+
+# Tempo maximo (segundos) que uma mensagem espera outra da mesma sessao terminar
+# antes de responder 409.
+SESSION_LOCK_TIMEOUT = float(os.getenv("SESSION_LOCK_TIMEOUT", "10"))
+
+# Processos dedicados a renderizacao de PDFs.
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_CACHE_MAX_ARQUIVOS = int(os.getenv("PDF_CACHE_MAX_ARQUIVOS", "500"))
+
+# Threads dedicadas ao processamento do chat (/chat e /chat-voz), separadas do
+# threadpool padrao do Starlette.
+CHAT_WORKERS = int(os.getenv("CHAT_WORKERS", "16"))
+
+# Importa o reportlab e monta o layout fixo do PDF durante o aquecimento do
+# processo principal. Desligado, o custo fica para o primeiro PDF gerado.
+AQUECER_PDF = os.getenv("AQUECER_PDF", "false").lower() == "true"
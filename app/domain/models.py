@@ -1,10 +1,14 @@
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field
+import math
+import time
 from typing import Optional
 
 from app.domain.states import ESTADOS
+from app.domain.texto import normalizar
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Movel:
     id: int
     nome: str
@@ -18,8 +22,14 @@ class Movel:
     area: float
     descricao: str
 
+    def __copy__(self) -> "Movel":
+        return self
 
-@dataclass
+    def __deepcopy__(self, memo) -> "Movel":
+        return self
+
+
+@dataclass(frozen=True, slots=True)
 class Componente:
     nome: str
     categoria_funcional: str
@@ -31,11 +41,308 @@ class Componente:
     def total(self) -> float:
         return self.quantidade * self.preco_unitario
 
+    def __copy__(self) -> "Componente":
+        return self
+
+    def __deepcopy__(self, memo) -> "Componente":
+        return self
+
+
+def _acumular(parciais: list[float], valor: float) -> None:
+    # Soma exata de Shewchuk (a mesma do math.fsum): as parciais nao se sobrepoem
+    # e somam exatamente os valores acumulados, entao o total nao deriva.
+    i = 0
+    for parcial in parciais:
+        if abs(valor) < abs(parcial):
+            valor, parcial = parcial, valor
+        alto = valor + parcial
+        baixo = parcial - (alto - valor)
+        if baixo:
+            parciais[i] = baixo
+            i += 1
+        valor = alto
+    parciais[i:] = [valor]
+
+
+class _ListaTotalizada(list):
+    __slots__ = ("_dono", "_parciais", "_total")
+    _vincula = False
+
+    def __init__(self, itens=()) -> None:
+        super().__init__(itens)
+        self._dono = None
+        if self._vincula:
+            for item in self:
+                self._vincular(item)
+        self._parciais = []
+        self._total = 0.0
+        self._ajustar((), map(self._valor, self))
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def _valor(self, item) -> float:
+        raise NotImplementedError
+
+    def _vincular(self, item) -> None:
+        pass
+
+    def _desvincular(self, item) -> None:
+        pass
+
+    def _alterada(self) -> None:
+        pass
+
+    def _trocar(self, saidas, entradas) -> None:
+        if self._vincula:
+            for item in saidas:
+                self._desvincular(item)
+            for item in entradas:
+                self._vincular(item)
+        self._alterada()
+        self._ajustar(map(self._valor, saidas), map(self._valor, entradas))
+
+    def _ajustar(self, saidas, entradas) -> None:
+        for valor in saidas:
+            _acumular(self._parciais, -valor)
+        for valor in entradas:
+            _acumular(self._parciais, valor)
+        anterior, self._total = self._total, math.fsum(self._parciais)
+        if self._total != anterior and self._dono is not None:
+            self._dono._total_alterado(anterior, self._total)
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    def append(self, item) -> None:
+        super().append(item)
+        self._trocar((), (item,))
+
+    def extend(self, itens) -> None:
+        itens = list(itens)
+        super().extend(itens)
+        self._trocar((), itens)
+
+    def __iadd__(self, itens):
+        self.extend(itens)
+        return self
+
+    def insert(self, posicao, item) -> None:
+        super().insert(posicao, item)
+        self._trocar((), (item,))
+
+    def pop(self, posicao=-1):
+        item = super().pop(posicao)
+        self._trocar((item,), ())
+        return item
+
+    def remove(self, item) -> None:
+        self.pop(self.index(item))
+
+    def clear(self) -> None:
+        itens = list(self)
+        super().clear()
+        self._trocar(itens, ())
+
+    def __setitem__(self, posicao, valor) -> None:
+        if isinstance(posicao, slice):
+            antigos, valor = self[posicao], list(valor)
+            super().__setitem__(posicao, valor)
+            self._trocar(antigos, valor)
+            return
+        antigo = self[posicao]
+        super().__setitem__(posicao, valor)
+        self._trocar((antigo,), (valor,))
+
+    def __delitem__(self, posicao) -> None:
+        antigos = self[posicao] if isinstance(posicao, slice) else (self[posicao],)
+        super().__delitem__(posicao)
+        self._trocar(antigos, ())
+
+    def __imul__(self, vezes):
+        antigos = list(self)
+        super().__imul__(vezes)
+        self._trocar(antigos, list(self))
+        return self
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._alterada()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._alterada()
+
+
+def _categoria(item: Componente) -> str:
+    return normalizar(item.categoria_funcional)
+
+
+def _retirar_posicao(indice: dict[str, list[int]], categoria: str, posicao: int) -> None:
+    posicoes = indice[categoria]
+    del posicoes[bisect_left(posicoes, posicao)]
+    if not posicoes:
+        del indice[categoria]
+
+
+class ListaComponentes(_ListaTotalizada):
+    __slots__ = ("_por_categoria",)
 
-@dataclass
+    def __init__(self, itens=()) -> None:
+        self._por_categoria = None
+        super().__init__(itens)
+
+    def _valor(self, item: Componente) -> float:
+        return item.total()
+
+    def _alterada(self) -> None:
+        self._por_categoria = None
+        if self._dono is not None:
+            self._dono._marcar_alterado()
+
+    def append(self, item: Componente) -> None:
+        indice = self._por_categoria
+        super().append(item)
+        if indice is not None:
+            indice.setdefault(_categoria(item), []).append(len(self) - 1)
+            self._por_categoria = indice
+
+    def pop(self, posicao=-1) -> Componente:
+        indice = self._por_categoria
+        item = super().pop(posicao)
+        if indice is not None:
+            if posicao < 0:
+                posicao += len(self) + 1
+            _retirar_posicao(indice, _categoria(item), posicao)
+            if posicao < len(self):
+                for posicoes in indice.values():
+                    for i in range(bisect_right(posicoes, posicao), len(posicoes)):
+                        posicoes[i] -= 1
+            self._por_categoria = indice
+        return item
+
+    def __setitem__(self, posicao, valor) -> None:
+        indice = self._por_categoria
+        if indice is None or isinstance(posicao, slice):
+            super().__setitem__(posicao, valor)
+            return
+        anterior = self[posicao]
+        super().__setitem__(posicao, valor)
+        if posicao < 0:
+            posicao += len(self)
+        categoria_anterior, categoria = _categoria(anterior), _categoria(valor)
+        if categoria != categoria_anterior:
+            _retirar_posicao(indice, categoria_anterior, posicao)
+            insort(indice.setdefault(categoria, []), posicao)
+        self._por_categoria = indice
+
+    def _indice(self) -> dict[str, list[int]]:
+        if self._por_categoria is None:
+            indice: dict[str, list[int]] = {}
+            for posicao, item in enumerate(self):
+                indice.setdefault(_categoria(item), []).append(posicao)
+            self._por_categoria = indice
+        return self._por_categoria
+
+    def categorias(self) -> frozenset[str]:
+        return frozenset(self._indice())
+
+    def posicoes_categoria(self, categoria: str) -> tuple[int, ...]:
+        return tuple(self._indice().get(categoria, ()))
+
+    def substituir_categoria(self, categoria: str, novo: Componente) -> None:
+        posicoes = self.posicoes_categoria(categoria)
+        if not posicoes:
+            self.append(novo)
+            return
+        if len(posicoes) == 1:
+            self[posicoes[0]] = novo
+            return
+        primeira, removidas = posicoes[0], set(posicoes[1:])
+        self[:] = [
+            novo if posicao == primeira else item for posicao, item in enumerate(self) if posicao not in removidas
+        ]
+
+
+class ListaMoveis(_ListaTotalizada):
+    __slots__ = ()
+    _vincula = True
+
+    def _alterada(self) -> None:
+        if self._dono is not None:
+            self._dono._marcar_alterada()
+
+    def _valor(self, item: "ConfiguracaoMovel") -> float:
+        return item.total_geral()
+
+    def _vincular(self, item: "ConfiguracaoMovel") -> None:
+        object.__setattr__(item, "_lista", self)
+
+    def _desvincular(self, item: "ConfiguracaoMovel") -> None:
+        object.__setattr__(item, "_lista", None)
+
+
+def _mesmo_valor(anterior, valor) -> bool:
+    return anterior is valor or (isinstance(valor, (str, int, float)) and anterior == valor)
+
+
+_CAMPOS_CONTROLE = frozenset({"revisao", "_lista", "_posicao", "_alterado"})
+
+
+@dataclass(slots=True)
 class ConfiguracaoMovel:
     movel: Movel
     componentes: list[Componente] = field(default_factory=list)
+    L_mm: float = field(init=False)
+    A_mm: float = field(init=False)
+    P_mm: float = field(init=False)
+    material: str = field(init=False)
+    cor: str = field(init=False)
+    preco_atual: float = field(init=False)
+    revisao: int = field(default=0, init=False, compare=False)
+    _lista: Optional["ListaMoveis"] = field(default=None, init=False, repr=False, compare=False)
+    _posicao: int = field(default=-1, init=False, repr=False, compare=False)
+    _alterado: bool = field(default=True, init=False, repr=False, compare=False)
+
+    def __setattr__(self, nome: str, valor) -> None:
+        if nome == "componentes":
+            if not isinstance(valor, ListaComponentes) or valor._dono not in (None, self):
+                valor = ListaComponentes(valor)
+            valor._dono = self
+        lista = getattr(self, "_lista", None) if nome in ("componentes", "preco_atual") else None
+        anterior = self.total_geral() if lista is not None else 0.0
+        object.__setattr__(self, nome, valor)
+        if nome not in _CAMPOS_CONTROLE:
+            object.__setattr__(self, "_alterado", True)
+        if lista is not None:
+            lista._ajustar((anterior,), (self.total_geral(),))
+
+    def __getstate__(self) -> dict:
+        return {nome: getattr(self, nome) for nome in ConfiguracaoMovel.__slots__ if nome != "_lista"}
+
+    def __setstate__(self, estado: dict) -> None:
+        object.__setattr__(self, "_lista", None)
+        for nome, valor in estado.items():
+            object.__setattr__(self, nome, valor)
+        self.componentes = estado["componentes"]
+        object.__setattr__(self, "_alterado", estado.get("_alterado", True))
+
+    def _marcar_alterado(self) -> None:
+        object.__setattr__(self, "_alterado", True)
+
+    def restaurar_revisao(self, revisao: int, posicao: int) -> None:
+        object.__setattr__(self, "revisao", revisao)
+        object.__setattr__(self, "_posicao", posicao)
+        object.__setattr__(self, "_alterado", False)
+
+    def _carimbar(self, revisao: int, posicao: int) -> None:
+        if self._alterado or self._posicao != posicao:
+            self.restaurar_revisao(revisao, posicao)
+
+    def _total_alterado(self, anterior: float, novo: float) -> None:
+        if self._lista is not None:
+            self._lista._ajustar((self.preco_atual + anterior,), (self.preco_atual + novo,))
 
     def __post_init__(self) -> None:
         self.L_mm = self.movel.L_mm
@@ -57,15 +364,61 @@ class ConfiguracaoMovel:
         self.preco_atual = self.movel.preco_base * fator
 
     def total_componentes(self) -> float:
-        return sum(c.total() for c in self.componentes)
+        return self.componentes.total
 
     def total_geral(self) -> float:
         return self.preco_atual + self.total_componentes()
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversa:
     estado: str = ESTADOS["INICIO"]
     configuracao: Optional[ConfiguracaoMovel] = None
     categoria_selecionada: Optional[str] = None
     moveis_orcados: list[ConfiguracaoMovel] = field(default_factory=list)
+    catalogo_versao: Optional[int] = None
+    pdf_job_id: Optional[str] = None
+    pdf_filename: Optional[str] = None
+    revisao: int = 0
+    _alterada: bool = field(default=True, init=False, repr=False, compare=False)
+
+    def __setattr__(self, nome: str, valor) -> None:
+        if nome == "moveis_orcados":
+            if not isinstance(valor, ListaMoveis) or valor._dono not in (None, self):
+                valor = ListaMoveis(valor)
+            valor._dono = self
+        if nome not in ("revisao", "_alterada") and not _mesmo_valor(getattr(self, nome, None), valor):
+            object.__setattr__(self, "_alterada", True)
+        object.__setattr__(self, nome, valor)
+
+    def _marcar_alterada(self) -> None:
+        object.__setattr__(self, "_alterada", True)
+
+    def _total_alterado(self, anterior: float, novo: float) -> None:
+        self._marcar_alterada()
+
+    def total_orcamento(self) -> float:
+        return self.moveis_orcados.total
+
+    def restaurar_revisao(self, revisao: int) -> None:
+        object.__setattr__(self, "revisao", revisao)
+        object.__setattr__(self, "_alterada", False)
+        if self.configuracao is not None:
+            self.configuracao._carimbar(revisao, -1)
+
+    def registrar_revisao(self) -> bool:
+        alterados = [
+            (posicao, config)
+            for posicao, config in enumerate(self.moveis_orcados)
+            if config._alterado or config._posicao != posicao
+        ]
+        configuracao_alterada = self.configuracao is not None and self.configuracao._alterado
+        if not (self._alterada or alterados or configuracao_alterada):
+            return False
+
+        # Derivada do relogio para nao repetir valores de uma sessao descartada e recriada.
+        revisao = max(self.revisao + 1, time.time_ns() // 1000)
+        for posicao, config in alterados:
+            config.restaurar_revisao(revisao, posicao)
+        self.restaurar_revisao(revisao)
+        return True
@@ -0,0 +1,35 @@
+from functools import lru_cache
+import unicodedata
+
+NORMALIZAR_CACHE = 8192
+
+
+def _sem_marcas(txt: str) -> str:
+    txt = unicodedata.normalize("NFD", txt)
+    return "".join(c for c in txt if unicodedata.category(c) != "Mn")
+
+
+def _tabela_acentos() -> bytes:
+    tabela = bytearray(range(256))
+    for codigo in range(0x80, 0x100):
+        base = _sem_marcas(chr(codigo))
+        if len(base) == 1 and ord(base) < 0x100:
+            tabela[codigo] = ord(base)
+    return bytes(tabela)
+
+
+# Acentos do portugues (e demais letras latin-1) -> letra base, byte a byte.
+_ACENTOS = _tabela_acentos()
+
+
+@lru_cache(maxsize=NORMALIZAR_CACHE)
+def normalizar(txt: str) -> str:
+    txt = txt.lower().strip()
+    if not txt.isascii():
+        try:
+            txt = txt.encode("latin-1").translate(_ACENTOS).decode("latin-1")
+        except UnicodeEncodeError:
+            txt = _sem_marcas(txt)
+    if txt.endswith("s"):
+        txt = txt[:-1]
+    return txt
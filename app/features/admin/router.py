@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+
+from app.features.admin.service import obter_status_catalogo, obter_status_sessoes, recarregar_catalogo
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/catalogo")
+def get_status_catalogo() -> dict:
+    return obter_status_catalogo()
+
+
+@router.post("/catalogo/recarregar")
+def post_recarregar_catalogo() -> dict:
+    return recarregar_catalogo()
+
+
+@router.get("/sessoes")
+def get_status_sessoes() -> dict:
+    return obter_status_sessoes()
@@ -0,0 +1,15 @@
+from app.features.conversations.store import estatisticas_sessoes
+from app.features.orcamento.catalogo.catalogo_snapshot import recarregar_se_alterado, status_catalogo
+
+
+def obter_status_catalogo() -> dict:
+    return status_catalogo()
+
+
+def recarregar_catalogo() -> dict:
+    recarregado = recarregar_se_alterado(forcar=True)
+    return {"recarregado": recarregado, **status_catalogo()}
+
+
+def obter_status_sessoes() -> dict:
+    return estatisticas_sessoes()
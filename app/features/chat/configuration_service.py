@@ -2,7 +2,7 @@ from app.domain.models import ConfiguracaoMovel
 from app.features.orcamento.catalogo.catalogo_repository import buscar_componentes_do_movel
 
 
-def criar_configuracao_padrao(movel):
+def criar_configuracao_padrao(movel, catalogo_versao=None):
     config = ConfiguracaoMovel(movel)
-    config.componentes = buscar_componentes_do_movel(movel.id)
+    config.componentes = buscar_componentes_do_movel(movel.id, catalogo_versao)
     return config
@@ -26,3 +26,10 @@ def resposta_com_opcoes(texto: str, opcoes: list[dict]) -> dict:
         "response": texto,
         "options": [{"id": o["id"], "label": o["label"]} for o in opcoes],
     }
+
+
+def resposta_com_pares(texto: str, pares: tuple[tuple[str, str], ...]) -> dict:
+    return {
+        "response": texto,
+        "options": [{"id": id_opcao, "label": label} for id_opcao, label in pares],
+    }
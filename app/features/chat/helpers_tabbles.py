@@ -1,15 +1,7 @@
-import unicodedata
+from app.domain.models import ListaMoveis
 
 
-def normalizar(txt: str) -> str:
-    txt = txt.lower().strip()
-    txt = unicodedata.normalize("NFD", txt)
-    txt = "".join(c for c in txt if unicodedata.category(c) != "Mn")
-    if txt.endswith("s"):
-        txt = txt[:-1]
-    return txt
-
-def gerar_tabela_moveis_orcados(moveis: list) -> str:
+def gerar_tabela_moveis_orcados(moveis: ListaMoveis) -> str:
     if not moveis:
         return "Nenhum movel orcado ainda."
 
@@ -22,7 +14,6 @@ def gerar_tabela_moveis_orcados(moveis: list) -> str:
         texto += f"   Cor: {config.cor} | Material: {config.material}\n"
         texto += f"   Valor: R$ {total:.2f}\n\n"
 
-    total_geral = sum(m.total_geral() for m in moveis)
-    texto += f"\nTOTAL GERAL: R$ {total_geral:.2f}"
+    texto += f"\nTOTAL GERAL: R$ {moveis.total:.2f}"
 
     return texto
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException
 
 from app.features.chat.schemas import ChatRequest
-from app.features.chat.service import processar_mensagem
+from app.features.chat.service import processar_mensagem_async
 
 router = APIRouter(tags=["chat"])
 
@@ -12,11 +12,11 @@ def chat_options() -> dict:
 
 
 @router.post("/chat")
-def chat(payload: ChatRequest) -> dict:
+async def chat(payload: ChatRequest) -> dict:
     try:
         message = str(payload.message or "").strip()
         session_id = payload.session_id or "default"
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Erro ao processar requisicao: {exc}") from exc
 
-    return processar_mensagem(message=message, session_id=session_id)
+    return await processar_mensagem_async(message=message, session_id=session_id)
@@ -13,4 +13,6 @@ class ChatResponse(BaseModel):
     options: list[dict[str, Any]] | None = None
     pdf_ready: bool | None = None
     pdf_filename: str | None = None
+    pdf_job_id: str | None = None
+    status_url: str | None = None
     download_url: str | None = None
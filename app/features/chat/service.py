@@ -1,13 +1,25 @@
-﻿from app.domain.models import Componente
+﻿from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Callable, Optional
+
+from app.domain.models import Componente, Conversa
 from app.domain.states import ESTADOS
+from app.domain.texto import normalizar
 from app.features.chat.configuration_service import criar_configuracao_padrao
-from app.features.chat.formatters import gerar_resumo_configuracao, resposta_com_opcoes
-from app.features.chat.helpers_tabbles import gerar_tabela_moveis_orcados, normalizar
-from app.features.conversations.store import get_or_create_conversa
-from app.features.orcamento.catalogo.catalogo_repository import buscar_catalogo_componentes, buscar_movel_por_nome
-from app.features.orcamento.pdf.pdf_service import salvar_pdf_local
-
-CATALOGO = buscar_catalogo_componentes()
+from app.features.chat.executor import executar_bloqueante
+from app.features.chat.formatters import gerar_resumo_configuracao, resposta_com_opcoes, resposta_com_pares
+from app.features.chat.helpers_tabbles import gerar_tabela_moveis_orcados
+from app.features.conversations.store import aguardar_vez, sessao_conversa
+from app.features.metrics.service import CHAT_MENSAGEM_SEGUNDOS
+from app.features.orcamento.catalogo.catalogo_repository import (
+    buscar_catalogo_componentes,
+    buscar_moveis_por_nome,
+    buscar_opcao_componente,
+    componente_compartilhado,
+)
+from app.features.orcamento.catalogo.catalogo_respostas import memorizar
+from app.features.orcamento.catalogo.catalogo_snapshot import versao_atual_catalogo
+from app.features.orcamento.pdf.pdf_jobs import PdfJob, enfileirar_pdf
 
 MENU = [
     {"id": "1", "label": "📏 Dimensão"},
@@ -17,245 +29,348 @@ MENU = [
     {"id": "5", "label": "✅ Confirmar"},
 ]
 
+OPCOES_COR = [
+    {"id": "branco", "label": "Branco"},
+    {"id": "preto", "label": "Preto"},
+    {"id": "amadeirado", "label": "Amadeirado"},
+]
 
-def processar_mensagem(message: str, session_id: str) -> dict:
-    conversa = get_or_create_conversa(session_id)
+OPCOES_MATERIAL = [
+    {"id": "mdp", "label": "MDP"},
+    {"id": "mdf", "label": "MDF"},
+    {"id": "aluminio", "label": "Aluminio"},
+]
 
-    if conversa.estado == ESTADOS["INICIO"]:
-        movel = buscar_movel_por_nome(message)
+MAX_OPCOES_MOVEL = 5
+MARGEM_ESCOLHA_MOVEL = 0.5
 
-        if not movel:
-            return {"response": "Movel nao encontrado. Tente: Guarda-roupa, Cozinha, Rack..."}
+NAO_ENTENDI = "Nao entendi. Tente novamente."
 
-        conversa.configuracao = criar_configuracao_padrao(movel)
-        conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
-        return resposta_com_opcoes(gerar_resumo_configuracao(conversa.configuracao), MENU)
-
-    if conversa.estado == ESTADOS["CONFIGURANDO_MOVEL"]:
-        if message == "1":
-            conversa.estado = ESTADOS["ALTERAR_DIMENSAO"]
-            return {"response": "Digite as dimensoes no formato:\nL x A x P\nExemplo: 800 x 700 x 600"}
-
-        if message == "2":
-            conversa.estado = ESTADOS["ESCOLHER_COR"]
-            return resposta_com_opcoes(
-                "Escolha a cor:",
-                [
-                    {"id": "branco", "label": "Branco"},
-                    {"id": "preto", "label": "Preto"},
-                    {"id": "amadeirado", "label": "Amadeirado"},
-                ],
-            )
-
-        if message == "3":
-            conversa.estado = ESTADOS["ESCOLHER_MATERIAL"]
-            return resposta_com_opcoes(
-                "Escolha o material:",
-                [
-                    {"id": "mdp", "label": "MDP"},
-                    {"id": "mdf", "label": "MDF"},
-                    {"id": "aluminio", "label": "Aluminio"},
-                ],
-            )
-
-        if message == "4":
-            categorias = sorted({normalizar(c.categoria_funcional) for c in conversa.configuracao.componentes})
-            conversa.estado = ESTADOS["ESCOLHER_CATEGORIA_COMPONENTE"]
-            return resposta_com_opcoes(
-                "Qual componente deseja alterar?",
-                [{"id": c, "label": c.capitalize()} for c in categorias] + [{"id": "0", "label": "Voltar"}],
-            )
-
-        if message == "5":
-            conversa.estado = ESTADOS["CONFIRMANDO_MOVEL"]
-            total = conversa.configuracao.total_geral()
-            return resposta_com_opcoes(
-                f"Movel configurado com sucesso.\n{conversa.configuracao.nome_movel}\nValor: R$ {total:.2f}\nDeseja confirmar este movel no orcamento?",
-                [
-                    {"id": "sim", "label": "Sim, adicionar ao orcamento"},
-                    {"id": "nao", "label": "Nao, continuar editando"},
-                ],
-            )
-
-    if conversa.estado == ESTADOS["CONFIRMANDO_MOVEL"]:
-        if message.lower() == "sim":
-            conversa.moveis_orcados.append(conversa.configuracao)
-            conversa.configuracao = None
-            conversa.estado = ESTADOS["ADICIONAR_MAIS_MOVEIS"]
-            qtd_moveis = len(conversa.moveis_orcados)
-            return resposta_com_opcoes(
-                f"Movel adicionado ao orcamento.\nVoce tem {qtd_moveis} movel(is) no orcamento.\nO que deseja fazer agora?",
-                [
-                    {"id": "mais", "label": "Orcar mais moveis"},
-                    {"id": "revisar", "label": "Revisar orcamento"},
-                    {"id": "finalizar", "label": "Finalizar e gerar PDF"},
-                ],
-            )
-
-        if message.lower() == "nao":
-            conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
-            return resposta_com_opcoes("Voltando para edicao...\n\n" + gerar_resumo_configuracao(conversa.configuracao), MENU)
-
-    if conversa.estado == ESTADOS["ADICIONAR_MAIS_MOVEIS"]:
-        if message.lower() == "mais":
-            conversa.estado = ESTADOS["INICIO"]
-            return {"response": "Perfeito! Qual movel deseja orcar?\nExemplos: Guarda-roupa, Cozinha, Rack, Estante..."}
-
-        if message.lower() == "revisar":
-            conversa.estado = ESTADOS["REVISAO_FINAL"]
-            tabela = gerar_tabela_moveis_orcados(conversa.moveis_orcados)
-            return resposta_com_opcoes(
-                tabela + "\n\nO que deseja fazer?",
-                [
-                    {"id": "mais", "label": "Adicionar mais moveis"},
-                    {"id": "remover", "label": "Remover movel"},
-                    {"id": "finalizar", "label": "Finalizar e gerar PDF"},
-                ],
-            )
-
-        if message.lower() == "finalizar":
+
+@dataclass
+class Mensagem:
+    texto: str
+    session_id: str
+    minuscula: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.minuscula = self.texto.lower()
+
+    @cached_property
+    def normalizada(self) -> str:
+        return normalizar(self.texto)
+
+
+Handler = Callable[[Conversa, Mensagem], Optional[dict]]
+
+HANDLERS: dict[str, Handler] = {}
+
+
+def registrar_estado(estado: str) -> Callable[[Handler], Handler]:
+    def decorator(handler: Handler) -> Handler:
+        HANDLERS[estado] = handler
+        return handler
+
+    return decorator
+
+
+def _registrar_pdf_concluido(job: PdfJob) -> None:
+    with sessao_conversa(job.session_id, criar=False, timeout=None) as conversa:
+        if not conversa or conversa.pdf_job_id != job.id:
+            return
+
+        if job.filename:
+            conversa.pdf_filename = job.filename
+        elif conversa.estado == ESTADOS["FINALIZADO"]:
             conversa.estado = ESTADOS["REVISAO_FINAL"]
-            tabela = gerar_tabela_moveis_orcados(conversa.moveis_orcados)
-            return resposta_com_opcoes(
-                tabela + "\n\nConfirma a finalizacao do orcamento?",
-                [
-                    {"id": "confirmar", "label": "Sim, gerar PDF"},
-                    {"id": "mais", "label": "Adicionar mais moveis"},
-                    {"id": "remover", "label": "Remover movel"},
-                ],
-            )
-
-    if conversa.estado == ESTADOS["REVISAO_FINAL"]:
-        if message.lower() == "mais":
-            conversa.estado = ESTADOS["INICIO"]
-            return {"response": "Qual movel deseja adicionar ao orcamento?"}
-
-        if message.lower() == "remover":
-            if not conversa.moveis_orcados:
-                return {"response": "Nao ha moveis para remover."}
-
-            opcoes = [
-                {
-                    "id": str(idx),
-                    "label": f"{idx}. {m.nome_movel} - R$ {m.total_geral():.2f}",
-                }
-                for idx, m in enumerate(conversa.moveis_orcados, 1)
-            ]
-            opcoes.append({"id": "0", "label": "Cancelar"})
-            return resposta_com_opcoes("Qual movel deseja remover?", opcoes)
-
-        if message.lower() in {"confirmar", "finalizar"}:
-            try:
-                filename = salvar_pdf_local(conversa.moveis_orcados, session_id)
-                conversa.estado = ESTADOS["FINALIZADO"]
-                total_final = sum(m.total_geral() for m in conversa.moveis_orcados)
-                qtd_moveis = len(conversa.moveis_orcados)
-                return {
-                    "response": (
-                        "Orcamento finalizado com sucesso.\n"
-                        f"Total de moveis: {qtd_moveis}\n"
-                        f"Valor total: R$ {total_final:.2f}\n"
-                        "Seu PDF esta pronto para download."
-                    ),
-                    "pdf_ready": True,
-                    "pdf_filename": filename,
-                    "download_url": f"/download-pdf/{session_id}",
-                }
-            except Exception as exc:
-                return {"response": f"Erro ao gerar PDF: {exc}"}
-
-        if message.isdigit():
-            if message == "0":
-                tabela = gerar_tabela_moveis_orcados(conversa.moveis_orcados)
-                return resposta_com_opcoes(
-                    tabela,
-                    [
-                        {"id": "mais", "label": "Adicionar mais moveis"},
-                        {"id": "remover", "label": "Remover movel"},
-                        {"id": "finalizar", "label": "Finalizar e gerar PDF"},
-                    ],
-                )
-
-            idx = int(message) - 1
-            if 0 <= idx < len(conversa.moveis_orcados):
-                movel_removido = conversa.moveis_orcados.pop(idx)
-                if not conversa.moveis_orcados:
-                    conversa.estado = ESTADOS["INICIO"]
-                    return {"response": "Movel removido. Nao ha mais moveis no orcamento. Vamos comecar um novo orcamento?"}
-
-                tabela = gerar_tabela_moveis_orcados(conversa.moveis_orcados)
-                return resposta_com_opcoes(
-                    f"{movel_removido.nome_movel} removido.\n\n{tabela}",
-                    [
-                        {"id": "mais", "label": "Adicionar mais moveis"},
-                        {"id": "remover", "label": "Remover outro movel"},
-                        {"id": "finalizar", "label": "Finalizar e gerar PDF"},
-                    ],
-                )
-
-    if conversa.estado == ESTADOS["ALTERAR_DIMENSAO"]:
-        try:
-            partes = message.lower().replace(" ", "").split("x")
-            largura, altura, profundidade = map(float, partes)
-            conversa.configuracao.L_mm = largura
-            conversa.configuracao.A_mm = altura
-            conversa.configuracao.P_mm = profundidade
-            conversa.configuracao.recalcular_preco_por_area()
-            conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
-            return resposta_com_opcoes("Dimensao atualizada.\n\n" + gerar_resumo_configuracao(conversa.configuracao), MENU)
-        except Exception:
-            return {"response": "Formato invalido. Use: 800 x 700 x 600"}
-
-    if conversa.estado == ESTADOS["ESCOLHER_COR"]:
-        conversa.configuracao.cor = message.capitalize()
-        conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
-        return resposta_com_opcoes(gerar_resumo_configuracao(conversa.configuracao), MENU)
 
-    if conversa.estado == ESTADOS["ESCOLHER_MATERIAL"]:
-        conversa.configuracao.material = message.upper()
-        conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
-        return resposta_com_opcoes(gerar_resumo_configuracao(conversa.configuracao), MENU)
 
-    if conversa.estado == ESTADOS["ESCOLHER_CATEGORIA_COMPONENTE"]:
-        if message == "0":
-            conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
-            return resposta_com_opcoes("Voltando ao menu principal...\n\n" + gerar_resumo_configuracao(conversa.configuracao), MENU)
+def processar_mensagem(message: str, session_id: str) -> dict:
+    mensagem = Mensagem(message, session_id)
+    with sessao_conversa(session_id) as conversa:
+        with CHAT_MENSAGEM_SEGUNDOS.cronometrar(conversa.estado):
+            return despachar(conversa, mensagem)
+
+
+async def processar_mensagem_async(message: str, session_id: str) -> dict:
+    async with aguardar_vez(session_id):
+        return await executar_bloqueante(processar_mensagem, message, session_id)
+
+
+def despachar(conversa: Conversa, mensagem: Mensagem) -> dict:
+    handler = HANDLERS.get(conversa.estado)
+    if handler is None:
+        return {"response": NAO_ENTENDI}
+    return handler(conversa, mensagem) or {"response": NAO_ENTENDI}
+
+
+def _menu_configuracao(conversa: Conversa, prefixo: str = "") -> dict:
+    return resposta_com_opcoes(prefixo + gerar_resumo_configuracao(conversa.configuracao), MENU)
+
+
+# Os caches guardam so tuplas (id, label); cada resposta monta dicts novos.
+@lru_cache(maxsize=256)
+def _opcoes_categorias(categorias: frozenset[str]) -> tuple[tuple[str, str], ...]:
+    return tuple((c, c.capitalize()) for c in sorted(categorias)) + (("0", "Voltar"),)
+
+
+def _opcoes_componente(opcoes) -> tuple[tuple[str, str], ...]:
+    return tuple((c["id"], f"{c['nome']} (R$ {c['preco_unitario']:.2f})") for c in opcoes)
+
+
+def _opcoes_revisao(texto: str, remover_label: str = "Remover movel") -> dict:
+    return resposta_com_opcoes(
+        texto,
+        [
+            {"id": "mais", "label": "Adicionar mais moveis"},
+            {"id": "remover", "label": remover_label},
+            {"id": "finalizar", "label": "Finalizar e gerar PDF"},
+        ],
+    )
+
+
+@registrar_estado(ESTADOS["INICIO"])
+def _estado_inicio(conversa: Conversa, mensagem: Mensagem) -> Optional[dict]:
+    catalogo_versao = versao_atual_catalogo()
+    resultados = buscar_moveis_por_nome(mensagem.texto, MAX_OPCOES_MOVEL, catalogo_versao)
 
-        categoria = normalizar(message)
-        if categoria not in CATALOGO:
-            return {"response": "Categoria invalida. Tente novamente."}
+    if not resultados:
+        return {"response": "Movel nao encontrado. Tente: Guarda-roupa, Cozinha, Rack..."}
 
-        conversa.categoria_selecionada = categoria
-        conversa.estado = ESTADOS["ESCOLHER_COMPONENTE"]
+    melhor = resultados[0]
+    if not melhor.exato and len(resultados) > 1 and melhor.score - resultados[1].score < MARGEM_ESCOLHA_MOVEL:
         return resposta_com_opcoes(
-            "Escolha o novo componente:",
+            "Encontrei mais de um movel parecido. Qual deles deseja orcar?",
+            [{"id": r.movel.nome, "label": r.movel.nome} for r in resultados],
+        )
+
+    conversa.catalogo_versao = catalogo_versao
+    conversa.configuracao = criar_configuracao_padrao(melhor.movel, catalogo_versao)
+    conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
+    return _menu_configuracao(conversa)
+
+
+@registrar_estado(ESTADOS["CONFIGURANDO_MOVEL"])
+def _estado_configurando_movel(conversa: Conversa, mensagem: Mensagem) -> Optional[dict]:
+    if mensagem.texto == "1":
+        conversa.estado = ESTADOS["ALTERAR_DIMENSAO"]
+        return {"response": "Digite as dimensoes no formato:\nL x A x P\nExemplo: 800 x 700 x 600"}
+
+    if mensagem.texto == "2":
+        conversa.estado = ESTADOS["ESCOLHER_COR"]
+        return resposta_com_opcoes("Escolha a cor:", OPCOES_COR)
+
+    if mensagem.texto == "3":
+        conversa.estado = ESTADOS["ESCOLHER_MATERIAL"]
+        return resposta_com_opcoes("Escolha o material:", OPCOES_MATERIAL)
+
+    if mensagem.texto == "4":
+        conversa.estado = ESTADOS["ESCOLHER_CATEGORIA_COMPONENTE"]
+        return resposta_com_pares(
+            "Qual componente deseja alterar?", _opcoes_categorias(conversa.configuracao.componentes.categorias())
+        )
+
+    if mensagem.texto == "5":
+        conversa.estado = ESTADOS["CONFIRMANDO_MOVEL"]
+        total = conversa.configuracao.total_geral()
+        return resposta_com_opcoes(
+            f"Movel configurado com sucesso.\n{conversa.configuracao.nome_movel}\nValor: R$ {total:.2f}\nDeseja confirmar este movel no orcamento?",
             [
-                {"id": c["id"], "label": f"{c['nome']} (R$ {c['preco_unitario']:.2f})"}
-                for c in CATALOGO[categoria]
+                {"id": "sim", "label": "Sim, adicionar ao orcamento"},
+                {"id": "nao", "label": "Nao, continuar editando"},
             ],
         )
 
-    if conversa.estado == ESTADOS["ESCOLHER_COMPONENTE"]:
-        categoria = conversa.categoria_selecionada
-        opcao = next((c for c in CATALOGO[categoria] if c["id"] == message), None)
+    return None
 
-        if not opcao:
-            return {"response": "Opcao invalida. Tente novamente."}
 
-        conversa.configuracao.componentes = [
-            c for c in conversa.configuracao.componentes if normalizar(c.categoria_funcional) != categoria
-        ]
+@registrar_estado(ESTADOS["CONFIRMANDO_MOVEL"])
+def _estado_confirmando_movel(conversa: Conversa, mensagem: Mensagem) -> Optional[dict]:
+    if mensagem.minuscula == "sim":
+        conversa.moveis_orcados.append(conversa.configuracao)
+        conversa.configuracao = None
+        conversa.estado = ESTADOS["ADICIONAR_MAIS_MOVEIS"]
+        qtd_moveis = len(conversa.moveis_orcados)
+        return resposta_com_opcoes(
+            f"Movel adicionado ao orcamento.\nVoce tem {qtd_moveis} movel(is) no orcamento.\nO que deseja fazer agora?",
+            [
+                {"id": "mais", "label": "Orcar mais moveis"},
+                {"id": "revisar", "label": "Revisar orcamento"},
+                {"id": "finalizar", "label": "Finalizar e gerar PDF"},
+            ],
+        )
+
+    if mensagem.minuscula == "nao":
+        conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
+        return _menu_configuracao(conversa, "Voltando para edicao...\n\n")
+
+    return None
 
-        conversa.configuracao.componentes.append(
-            Componente(
-                nome=opcao["nome"],
-                categoria_funcional=categoria,
-                quantidade=1,
-                preco_unitario=opcao["preco_unitario"],
-            )
+
+@registrar_estado(ESTADOS["ADICIONAR_MAIS_MOVEIS"])
+def _estado_adicionar_mais_moveis(conversa: Conversa, mensagem: Mensagem) -> Optional[dict]:
+    if mensagem.minuscula == "mais":
+        conversa.estado = ESTADOS["INICIO"]
+        return {"response": "Perfeito! Qual movel deseja orcar?\nExemplos: Guarda-roupa, Cozinha, Rack, Estante..."}
+
+    if mensagem.minuscula == "revisar":
+        conversa.estado = ESTADOS["REVISAO_FINAL"]
+        tabela = gerar_tabela_moveis_orcados(conversa.moveis_orcados)
+        return _opcoes_revisao(tabela + "\n\nO que deseja fazer?")
+
+    if mensagem.minuscula == "finalizar":
+        conversa.estado = ESTADOS["REVISAO_FINAL"]
+        tabela = gerar_tabela_moveis_orcados(conversa.moveis_orcados)
+        return resposta_com_opcoes(
+            tabela + "\n\nConfirma a finalizacao do orcamento?",
+            [
+                {"id": "confirmar", "label": "Sim, gerar PDF"},
+                {"id": "mais", "label": "Adicionar mais moveis"},
+                {"id": "remover", "label": "Remover movel"},
+            ],
         )
 
+    return None
+
+
+def _finalizar_orcamento(conversa: Conversa, session_id: str) -> dict:
+    try:
+        job = enfileirar_pdf(conversa.moveis_orcados, session_id, ao_concluir=_registrar_pdf_concluido)
+    except Exception as exc:
+        return {"response": f"Erro ao gerar PDF: {exc}"}
+
+    conversa.estado = ESTADOS["FINALIZADO"]
+    conversa.pdf_job_id = job.id
+    conversa.pdf_filename = None
+    total_final = conversa.total_orcamento()
+    qtd_moveis = len(conversa.moveis_orcados)
+    return {
+        "response": (
+            "Orcamento finalizado com sucesso.\n"
+            f"Total de moveis: {qtd_moveis}\n"
+            f"Valor total: R$ {total_final:.2f}\n"
+            "Seu PDF esta sendo gerado."
+        ),
+        "pdf_ready": False,
+        "pdf_job_id": job.id,
+        "status_url": f"/status/{session_id}",
+        "download_url": f"/download-pdf/{session_id}",
+    }
+
+
+def _remover_movel_por_indice(conversa: Conversa, texto: str) -> Optional[dict]:
+    if texto == "0":
+        return _opcoes_revisao(gerar_tabela_moveis_orcados(conversa.moveis_orcados))
+
+    idx = int(texto) - 1
+    if not 0 <= idx < len(conversa.moveis_orcados):
+        return None
+
+    movel_removido = conversa.moveis_orcados.pop(idx)
+    if not conversa.moveis_orcados:
+        conversa.estado = ESTADOS["INICIO"]
+        return {"response": "Movel removido. Nao ha mais moveis no orcamento. Vamos comecar um novo orcamento?"}
+
+    tabela = gerar_tabela_moveis_orcados(conversa.moveis_orcados)
+    return _opcoes_revisao(f"{movel_removido.nome_movel} removido.\n\n{tabela}", "Remover outro movel")
+
+
+@registrar_estado(ESTADOS["REVISAO_FINAL"])
+def _estado_revisao_final(conversa: Conversa, mensagem: Mensagem) -> Optional[dict]:
+    if mensagem.minuscula == "mais":
+        conversa.estado = ESTADOS["INICIO"]
+        return {"response": "Qual movel deseja adicionar ao orcamento?"}
+
+    if mensagem.minuscula == "remover":
+        if not conversa.moveis_orcados:
+            return {"response": "Nao ha moveis para remover."}
+
+        opcoes = [
+            {
+                "id": str(idx),
+                "label": f"{idx}. {m.nome_movel} - R$ {m.total_geral():.2f}",
+            }
+            for idx, m in enumerate(conversa.moveis_orcados, 1)
+        ]
+        opcoes.append({"id": "0", "label": "Cancelar"})
+        return resposta_com_opcoes("Qual movel deseja remover?", opcoes)
+
+    if mensagem.minuscula in {"confirmar", "finalizar"}:
+        return _finalizar_orcamento(conversa, mensagem.session_id)
+
+    if mensagem.texto.isdigit():
+        return _remover_movel_por_indice(conversa, mensagem.texto)
+
+    return None
+
+
+@registrar_estado(ESTADOS["ALTERAR_DIMENSAO"])
+def _estado_alterar_dimensao(conversa: Conversa, mensagem: Mensagem) -> Optional[dict]:
+    try:
+        partes = mensagem.minuscula.replace(" ", "").split("x")
+        largura, altura, profundidade = map(float, partes)
+        conversa.configuracao.L_mm = largura
+        conversa.configuracao.A_mm = altura
+        conversa.configuracao.P_mm = profundidade
+        conversa.configuracao.recalcular_preco_por_area()
         conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
-        return resposta_com_opcoes("Componente atualizado.\n\n" + gerar_resumo_configuracao(conversa.configuracao), MENU)
+        return _menu_configuracao(conversa, "Dimensao atualizada.\n\n")
+    except Exception:
+        return {"response": "Formato invalido. Use: 800 x 700 x 600"}
+
+
+@registrar_estado(ESTADOS["ESCOLHER_COR"])
+def _estado_escolher_cor(conversa: Conversa, mensagem: Mensagem) -> Optional[dict]:
+    conversa.configuracao.cor = mensagem.texto.capitalize()
+    conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
+    return _menu_configuracao(conversa)
 
-    return {"response": "Nao entendi. Tente novamente."}
+
+@registrar_estado(ESTADOS["ESCOLHER_MATERIAL"])
+def _estado_escolher_material(conversa: Conversa, mensagem: Mensagem) -> Optional[dict]:
+    conversa.configuracao.material = mensagem.texto.upper()
+    conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
+    return _menu_configuracao(conversa)
+
+
+@registrar_estado(ESTADOS["ESCOLHER_CATEGORIA_COMPONENTE"])
+def _estado_escolher_categoria_componente(conversa: Conversa, mensagem: Mensagem) -> Optional[dict]:
+    if mensagem.texto == "0":
+        conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
+        return _menu_configuracao(conversa, "Voltando ao menu principal...\n\n")
+
+    catalogo = buscar_catalogo_componentes(conversa.catalogo_versao)
+    categoria = mensagem.normalizada
+    if categoria not in catalogo:
+        return {"response": "Categoria invalida. Tente novamente."}
+
+    conversa.categoria_selecionada = categoria
+    conversa.estado = ESTADOS["ESCOLHER_COMPONENTE"]
+    opcoes = memorizar(
+        conversa.catalogo_versao,
+        ("chat_opcoes_componente", categoria),
+        lambda snapshot: _opcoes_componente(snapshot.catalogo_componentes[categoria]),
+    )
+    return resposta_com_pares("Escolha o novo componente:", opcoes)
+
+
+@registrar_estado(ESTADOS["ESCOLHER_COMPONENTE"])
+def _estado_escolher_componente(conversa: Conversa, mensagem: Mensagem) -> Optional[dict]:
+    categoria = conversa.categoria_selecionada
+    opcao = buscar_opcao_componente(categoria, mensagem.texto, conversa.catalogo_versao)
+
+    if not opcao:
+        return {"response": "Opcao invalida. Tente novamente."}
+
+    novo = Componente(
+        nome=opcao["nome"],
+        categoria_funcional=categoria,
+        quantidade=1,
+        preco_unitario=opcao["preco_unitario"],
+    )
+    conversa.configuracao.componentes.substituir_categoria(
+        categoria, componente_compartilhado(novo, conversa.catalogo_versao)
+    )
+
+    conversa.estado = ESTADOS["CONFIGURANDO_MOVEL"]
+    return _menu_configuracao(conversa, "Componente atualizado.\n\n")
@@ -8,5 +8,5 @@ router = APIRouter(tags=["chat-voz"])
 
 
 @router.post("/chat-voz")
-def chat_voz(payload: ChatVoiceRequest) -> dict:
-    return processar_mensagem_voz(payload)
+async def chat_voz(payload: ChatVoiceRequest) -> dict:
+    return await processar_mensagem_voz(payload)
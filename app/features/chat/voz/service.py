@@ -1,10 +1,10 @@
 from fastapi import HTTPException, status
 
-from app.features.chat.service import processar_mensagem
+from app.features.chat.service import processar_mensagem_async
 from app.features.chat.voz.schemas import ChatVoiceRequest
 
 
-def processar_mensagem_voz(payload: ChatVoiceRequest) -> dict:
+async def processar_mensagem_voz(payload: ChatVoiceRequest) -> dict:
     message = str(payload.message or "").strip()
     session_id = payload.session_id or "default"
 
@@ -14,4 +14,4 @@ def processar_mensagem_voz(payload: ChatVoiceRequest) -> dict:
             detail="Audio invalido",
         )
 
-    return processar_mensagem(message=message, session_id=session_id)
+    return await processar_mensagem_async(message=message, session_id=session_id)
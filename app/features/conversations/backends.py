@@ -0,0 +1,345 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
+import uuid
+
+from app.domain.models import Conversa
+from app.features.conversations.serializacao import desserializar_conversa, serializar_conversa
+
+
+class SessaoOcupadaError(Exception):
+    pass
+
+
+class _TravaSessao:
+    __slots__ = ("ocupada", "fila", "usuarios")
+
+    def __init__(self) -> None:
+        self.ocupada = False
+        self.fila: deque[threading.Event] = deque()
+        self.usuarios = 0
+
+
+class _TravasPorSessao:
+    def __init__(self) -> None:
+        self._guarda = threading.Lock()
+        self._travas: dict[str, _TravaSessao] = {}
+        self.aquisicoes = 0
+        self.contendidas = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+
+    def _soltar(self, session_id: str, trava: _TravaSessao) -> None:
+        trava.usuarios -= 1
+        if trava.usuarios == 0:
+            del self._travas[session_id]
+
+    def registrar_espera(self, espera: float, contendida: bool = False) -> None:
+        with self._guarda:
+            self.contendidas += contendida
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+
+    def registrar_timeout(self) -> None:
+        with self._guarda:
+            self.timeouts += 1
+
+    def _adquirir(self, session_id: str, timeout: Optional[float]) -> _TravaSessao:
+        with self._guarda:
+            trava = self._travas.get(session_id)
+            if trava is None:
+                trava = self._travas[session_id] = _TravaSessao()
+            trava.usuarios += 1
+            self.aquisicoes += 1
+            if not trava.ocupada:
+                trava.ocupada = True
+                return trava
+            self.contendidas += 1
+            vez = threading.Event()
+            trava.fila.append(vez)
+
+        inicio = time.monotonic()
+        if not vez.wait(timeout):
+            with self._guarda:
+                if not vez.is_set():
+                    trava.fila.remove(vez)
+                    self._soltar(session_id, trava)
+                    self.timeouts += 1
+                    raise SessaoOcupadaError(session_id)
+        self.registrar_espera(time.monotonic() - inicio)
+        return trava
+
+    def _liberar(self, session_id: str, trava: _TravaSessao) -> None:
+        with self._guarda:
+            if trava.fila:
+                trava.fila.popleft().set()
+            else:
+                trava.ocupada = False
+            self._soltar(session_id, trava)
+
+    @contextmanager
+    def bloquear(self, session_id: str, timeout: Optional[float] = None) -> Iterator[None]:
+        trava = self._adquirir(session_id, timeout)
+        try:
+            yield
+        finally:
+            self._liberar(session_id, trava)
+
+    def estatisticas(self) -> dict:
+        with self._guarda:
+            aguardando = sum(len(trava.fila) for trava in self._travas.values())
+            return {
+                "aquisicoes": self.aquisicoes,
+                "contendidas": self.contendidas,
+                "timeouts": self.timeouts,
+                "aguardando": aguardando,
+                "espera_media_ms": round(self.espera_total / self.contendidas * 1000, 3) if self.contendidas else 0.0,
+                "espera_maxima_ms": round(self.espera_maxima * 1000, 3),
+            }
+
+
+class SessionStore(ABC):
+    def __init__(self, ttl_segundos: float = 0, max_sessoes: int = 0) -> None:
+        self._travas = _TravasPorSessao()
+        self.ttl_segundos = ttl_segundos
+        self.max_sessoes = max_sessoes
+        self.evicoes_ttl = 0
+        self.evicoes_capacidade = 0
+
+    @abstractmethod
+    def carregar(self, session_id: str) -> Optional[Conversa]:
+        ...
+
+    @abstractmethod
+    def salvar(self, session_id: str, conversa: Conversa) -> None:
+        ...
+
+    @abstractmethod
+    def remover(self, session_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def quantidade(self) -> int:
+        ...
+
+    @abstractmethod
+    def expirar(self) -> int:
+        ...
+
+    def estatisticas(self) -> dict:
+        ativas = self.quantidade()
+        return {
+            "backend": type(self).__name__,
+            "ativas": ativas,
+            "max_sessoes": self.max_sessoes or None,
+            "ocupacao": round(ativas / self.max_sessoes, 4) if self.max_sessoes else None,
+            "ttl_segundos": self.ttl_segundos or None,
+            "evicoes_ttl": self.evicoes_ttl,
+            "evicoes_capacidade": self.evicoes_capacidade,
+            "travas": self._travas.estatisticas(),
+        }
+
+    def registrar_espera(self, espera: float) -> None:
+        self._travas.registrar_espera(espera, contendida=True)
+
+    def registrar_timeout(self) -> None:
+        self._travas.registrar_timeout()
+
+    @contextmanager
+    def bloquear(self, session_id: str, timeout: Optional[float] = None) -> Iterator[None]:
+        with self._travas.bloquear(session_id, timeout):
+            yield
+
+
+class MemoriaSessionStore(SessionStore):
+    def __init__(self, ttl_segundos: float = 0, max_sessoes: int = 0) -> None:
+        super().__init__(ttl_segundos, max_sessoes)
+        self.conversas: "OrderedDict[str, Conversa]" = OrderedDict()
+        self._acessos: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _expirada(self, session_id: str, agora: float) -> bool:
+        return bool(self.ttl_segundos) and agora - self._acessos[session_id] > self.ttl_segundos
+
+    def _descartar(self, session_id: str) -> None:
+        del self.conversas[session_id]
+        del self._acessos[session_id]
+
+    def carregar(self, session_id: str) -> Optional[Conversa]:
+        agora = time.monotonic()
+        with self._lock:
+            conversa = self.conversas.get(session_id)
+            if conversa is None:
+                return None
+            if self._expirada(session_id, agora):
+                self._descartar(session_id)
+                self.evicoes_ttl += 1
+                return None
+            self.conversas.move_to_end(session_id)
+            self._acessos[session_id] = agora
+            return conversa
+
+    def salvar(self, session_id: str, conversa: Conversa) -> None:
+        with self._lock:
+            self.conversas[session_id] = conversa
+            self.conversas.move_to_end(session_id)
+            self._acessos[session_id] = time.monotonic()
+
+            while self.max_sessoes and len(self.conversas) > self.max_sessoes:
+                mais_antiga = next(iter(self.conversas))
+                self._descartar(mais_antiga)
+                self.evicoes_capacidade += 1
+
+    def remover(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id not in self.conversas:
+                return False
+            self._descartar(session_id)
+            return True
+
+    def quantidade(self) -> int:
+        return len(self.conversas)
+
+    def expirar(self) -> int:
+        if not self.ttl_segundos:
+            return 0
+
+        agora = time.monotonic()
+        removidas = 0
+        with self._lock:
+            while self.conversas:
+                mais_antiga = next(iter(self.conversas))
+                if not self._expirada(mais_antiga, agora):
+                    break
+                self._descartar(mais_antiga)
+                removidas += 1
+            self.evicoes_ttl += removidas
+        return removidas
+
+
+class SqliteSessionStore(SessionStore):
+    LEASE_SEGUNDOS = 30.0
+    ESPERA_INICIAL = 0.005
+    ESPERA_MAXIMA = 0.1
+
+    def __init__(self, caminho: Path, ttl_segundos: float = 0, max_sessoes: int = 0) -> None:
+        super().__init__(ttl_segundos, max_sessoes)
+        self._caminho = Path(caminho)
+        self._caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._dono = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        conexao = self._conexao()
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS conversas (
+                session_id TEXT PRIMARY KEY,
+                dados BLOB NOT NULL,
+                atualizado_em REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_conversas_atualizado_em ON conversas (atualizado_em);
+            CREATE TABLE IF NOT EXISTS travas (
+                session_id TEXT PRIMARY KEY,
+                dono TEXT NOT NULL,
+                expira_em REAL NOT NULL
+            );
+            """
+        )
+
+    def _conexao(self) -> sqlite3.Connection:
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self._caminho, timeout=10, isolation_level=None)
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            conexao.execute("PRAGMA busy_timeout=10000")
+            self._local.conexao = conexao
+        return conexao
+
+    def carregar(self, session_id: str) -> Optional[Conversa]:
+        linha = self._conexao().execute(
+            "SELECT dados, atualizado_em FROM conversas WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if not linha:
+            return None
+        if self.ttl_segundos and time.time() - linha[1] > self.ttl_segundos:
+            return None
+        return desserializar_conversa(linha[0])
+
+    def salvar(self, session_id: str, conversa: Conversa) -> None:
+        self._conexao().execute(
+            "INSERT INTO conversas (session_id, dados, atualizado_em) VALUES (?, ?, ?) "
+            "ON CONFLICT(session_id) DO UPDATE SET dados = excluded.dados, atualizado_em = excluded.atualizado_em",
+            (session_id, serializar_conversa(conversa), time.time()),
+        )
+
+    def remover(self, session_id: str) -> bool:
+        cursor = self._conexao().execute("DELETE FROM conversas WHERE session_id = ?", (session_id,))
+        return cursor.rowcount > 0
+
+    def quantidade(self) -> int:
+        return self._conexao().execute("SELECT COUNT(*) FROM conversas").fetchone()[0]
+
+    def expirar(self) -> int:
+        conexao = self._conexao()
+        removidas_ttl = 0
+        removidas_capacidade = 0
+
+        if self.ttl_segundos:
+            cursor = conexao.execute(
+                "DELETE FROM conversas WHERE atualizado_em < ?", (time.time() - self.ttl_segundos,)
+            )
+            removidas_ttl = max(cursor.rowcount, 0)
+
+        if self.max_sessoes:
+            cursor = conexao.execute(
+                "DELETE FROM conversas WHERE session_id IN "
+                "(SELECT session_id FROM conversas ORDER BY atualizado_em DESC LIMIT -1 OFFSET ?)",
+                (self.max_sessoes,),
+            )
+            removidas_capacidade = max(cursor.rowcount, 0)
+
+        conexao.execute("DELETE FROM travas WHERE expira_em < ?", (time.time(),))
+        self.evicoes_ttl += removidas_ttl
+        self.evicoes_capacidade += removidas_capacidade
+        return removidas_ttl + removidas_capacidade
+
+    def _adquirir_lease(self, session_id: str, dono: str) -> bool:
+        agora = time.time()
+        cursor = self._conexao().execute(
+            "INSERT INTO travas (session_id, dono, expira_em) VALUES (?, ?, ?) "
+            "ON CONFLICT(session_id) DO UPDATE SET dono = excluded.dono, expira_em = excluded.expira_em "
+            "WHERE travas.expira_em < ?",
+            (session_id, dono, agora + self.LEASE_SEGUNDOS, agora),
+        )
+        return cursor.rowcount > 0
+
+    def _liberar_lease(self, session_id: str, dono: str) -> None:
+        self._conexao().execute("DELETE FROM travas WHERE session_id = ? AND dono = ?", (session_id, dono))
+
+    @contextmanager
+    def bloquear(self, session_id: str, timeout: Optional[float] = None) -> Iterator[None]:
+        inicio = time.monotonic()
+        with self._travas.bloquear(session_id, timeout):
+            dono = f"{self._dono}-{threading.get_ident()}"
+            espera = self.ESPERA_INICIAL
+            inicio_lease = time.monotonic()
+            while not self._adquirir_lease(session_id, dono):
+                if timeout is not None and time.monotonic() - inicio + espera > timeout:
+                    self._travas.registrar_timeout()
+                    raise SessaoOcupadaError(session_id)
+                time.sleep(espera)
+                espera = min(espera * 2, self.ESPERA_MAXIMA)
+            if espera > self.ESPERA_INICIAL:
+                self._travas.registrar_espera(time.monotonic() - inicio_lease, contendida=True)
+            try:
+                yield
+            finally:
+                self._liberar_lease(session_id, dono)
@@ -0,0 +1,90 @@
+from dataclasses import astuple
+import json
+import sys
+from typing import Optional
+import zlib
+
+from app.domain.models import Componente, ConfiguracaoMovel, Conversa, Movel
+from app.features.orcamento.catalogo.catalogo_repository import componente_compartilhado, movel_compartilhado
+
+FORMATO_VERSAO = 1
+
+
+def _configuracao_para_dict(config: ConfiguracaoMovel) -> dict:
+    return {
+        "movel": astuple(config.movel),
+        "dim": [config.L_mm, config.A_mm, config.P_mm],
+        "material": config.material,
+        "cor": config.cor,
+        "preco": config.preco_atual,
+        "comp": [astuple(c) for c in config.componentes],
+        "rev": config.revisao,
+    }
+
+
+def _internar(valor):
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+def _configuracao_de_dict(dados: dict, catalogo_versao: Optional[int]) -> ConfiguracaoMovel:
+    movel = Movel(*map(_internar, dados["movel"]))
+    config = ConfiguracaoMovel(movel_compartilhado(movel, catalogo_versao))
+    config.componentes = [
+        componente_compartilhado(Componente(*map(_internar, c)), catalogo_versao) for c in dados["comp"]
+    ]
+    config.L_mm, config.A_mm, config.P_mm = dados["dim"]
+    config.material = _internar(dados["material"])
+    config.cor = _internar(dados["cor"])
+    config.preco_atual = dados["preco"]
+    return config
+
+
+def _movel_orcado_de_dict(dados: dict, posicao: int, catalogo_versao: Optional[int]) -> ConfiguracaoMovel:
+    config = _configuracao_de_dict(dados, catalogo_versao)
+    config.restaurar_revisao(dados.get("rev", 0), posicao)
+    return config
+
+
+def conversa_para_dict(conversa: Conversa) -> dict:
+    return {
+        "v": FORMATO_VERSAO,
+        "estado": conversa.estado,
+        "config": _configuracao_para_dict(conversa.configuracao) if conversa.configuracao else None,
+        "categoria": conversa.categoria_selecionada,
+        "moveis": [_configuracao_para_dict(m) for m in conversa.moveis_orcados],
+        "catalogo": conversa.catalogo_versao,
+        "pdf_job": conversa.pdf_job_id,
+        "pdf": conversa.pdf_filename,
+        "rev": conversa.revisao,
+    }
+
+
+def conversa_de_dict(dados: dict) -> Conversa:
+    if dados.get("v") != FORMATO_VERSAO:
+        raise ValueError(f"Formato de sessao nao suportado: {dados.get('v')}")
+
+    catalogo_versao = dados["catalogo"]
+    configuracao: Optional[ConfiguracaoMovel] = None
+    if dados["config"] is not None:
+        configuracao = _configuracao_de_dict(dados["config"], catalogo_versao)
+
+    conversa = Conversa(
+        estado=sys.intern(dados["estado"]),
+        configuracao=configuracao,
+        categoria_selecionada=_internar(dados["categoria"]),
+        moveis_orcados=[_movel_orcado_de_dict(m, i, catalogo_versao) for i, m in enumerate(dados["moveis"])],
+        catalogo_versao=catalogo_versao,
+        pdf_job_id=dados.get("pdf_job"),
+        pdf_filename=dados.get("pdf"),
+    )
+    conversa.restaurar_revisao(dados.get("rev", 0))
+    return conversa
+
+
+def serializar_conversa(conversa: Conversa) -> bytes:
+    texto = json.dumps(conversa_para_dict(conversa), separators=(",", ":"), ensure_ascii=False)
+    return zlib.compress(texto.encode("utf-8"))
+
+
+def desserializar_conversa(dados: bytes) -> Conversa:
+    return conversa_de_dict(json.loads(zlib.decompress(dados).decode("utf-8")))
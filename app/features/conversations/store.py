@@ -1,20 +1,157 @@
-from typing import Optional
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+import logging
+from threading import Event, Thread
+import time
+from typing import AsyncIterator, Iterator, Optional
 
+from fastapi import HTTPException
+
+from app.config.settings import (
+    SESSION_DB_PATH,
+    SESSION_LOCK_TIMEOUT,
+    SESSION_MAX_SESSIONS,
+    SESSION_STORE,
+    SESSION_TTL_SECONDS,
+)
 from app.domain.models import Conversa
+from app.features.conversations.backends import (
+    MemoriaSessionStore,
+    SessaoOcupadaError,
+    SessionStore,
+    SqliteSessionStore,
+)
+from app.features.metrics.service import Medidor
+
+logger = logging.getLogger(__name__)
+
+
+def criar_store(tipo: str = SESSION_STORE) -> SessionStore:
+    if tipo == "memory":
+        return MemoriaSessionStore(SESSION_TTL_SECONDS, SESSION_MAX_SESSIONS)
+    if tipo == "sqlite":
+        return SqliteSessionStore(SESSION_DB_PATH, SESSION_TTL_SECONDS, SESSION_MAX_SESSIONS)
+    raise ValueError(f"SESSION_STORE invalido: {tipo}")
+
+
+store: SessionStore = criar_store()
+
+Medidor("quio_sessoes_ativas", "Sessoes de conversa armazenadas", lambda: store.quantidade())
+
+_limpeza_thread: Optional[Thread] = None
+_limpeza_parar = Event()
+
+
+# Fila por sessao no event loop: [trava, usuarios]. Mensagens da mesma sessao
+# esperam aqui, sem ocupar uma thread do pool do chat.
+_filas_sessao: dict[str, list] = {}
+
+
+def _sessao_ocupada() -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail="Sessao ocupada processando outra mensagem. Tente novamente.",
+        headers={"Retry-After": "1"},
+    )
+
+
+@contextmanager
+def _bloquear_sessao(session_id: str, timeout: Optional[float]) -> Iterator[None]:
+    try:
+        with store.bloquear(session_id, timeout):
+            yield
+    except SessaoOcupadaError as exc:
+        raise _sessao_ocupada() from exc
+
+
+@asynccontextmanager
+async def aguardar_vez(session_id: str, timeout: Optional[float] = SESSION_LOCK_TIMEOUT) -> AsyncIterator[None]:
+    fila = _filas_sessao.setdefault(session_id, [asyncio.Lock(), 0])
+    fila[1] += 1
+    try:
+        trava = fila[0]
+        contendida = trava.locked()
+        inicio = time.monotonic()
+        try:
+            await asyncio.wait_for(trava.acquire(), timeout)
+        except asyncio.TimeoutError as exc:
+            store.registrar_timeout()
+            raise _sessao_ocupada() from exc
+        if contendida:
+            store.registrar_espera(time.monotonic() - inicio)
 
-conversas: dict[str, Conversa] = {}
+        try:
+            yield
+        finally:
+            trava.release()
+    finally:
+        fila[1] -= 1
+        if fila[1] == 0:
+            del _filas_sessao[session_id]
+
+
+@contextmanager
+def sessao_conversa(
+    session_id: str,
+    criar: bool = True,
+    timeout: Optional[float] = SESSION_LOCK_TIMEOUT,
+) -> Iterator[Optional[Conversa]]:
+    with _bloquear_sessao(session_id, timeout):
+        conversa = store.carregar(session_id)
+        if conversa is None and criar:
+            conversa = Conversa()
+
+        yield conversa
+
+        if conversa is not None:
+            conversa.registrar_revisao()
+            store.salvar(session_id, conversa)
 
 
 def get_or_create_conversa(session_id: str) -> Conversa:
-    return conversas.setdefault(session_id, Conversa())
+    with sessao_conversa(session_id) as conversa:
+        return conversa
 
 
 def get_conversa(session_id: str) -> Optional[Conversa]:
-    return conversas.get(session_id)
+    return store.carregar(session_id)
 
 
 def reset_conversa(session_id: str) -> bool:
-    if session_id not in conversas:
-        return False
-    del conversas[session_id]
-    return True
+    with _bloquear_sessao(session_id, SESSION_LOCK_TIMEOUT):
+        return store.remover(session_id)
+
+
+def estatisticas_sessoes() -> dict:
+    return store.estatisticas()
+
+
+def _loop_limpeza(intervalo: float) -> None:
+    while not _limpeza_parar.wait(intervalo):
+        try:
+            removidas = store.expirar()
+        except Exception:
+            logger.exception("Falha ao expirar sessoes")
+            continue
+        if removidas:
+            logger.info("%s sessoes expiradas removidas", removidas)
+
+
+def iniciar_limpeza_sessoes(intervalo: float) -> None:
+    global _limpeza_thread
+
+    if intervalo <= 0 or (_limpeza_thread is not None and _limpeza_thread.is_alive()):
+        return
+
+    _limpeza_parar.clear()
+    _limpeza_thread = Thread(target=_loop_limpeza, args=(intervalo,), name="sessoes-limpeza", daemon=True)
+    _limpeza_thread.start()
+
+
+def parar_limpeza_sessoes() -> None:
+    global _limpeza_thread
+
+    _limpeza_parar.set()
+    if _limpeza_thread is not None:
+        _limpeza_thread.join(timeout=5)
+    _limpeza_thread = None
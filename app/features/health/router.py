@@ -1,4 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+
+from app.features.health.service import aplicacao_pronta, relatorio_inicializacao
 
 router = APIRouter(tags=["health"])
 
@@ -9,3 +11,11 @@ def health() -> dict:
         "status": "ok",
         "message": "Backend FastAPI rodando com sucesso!",
     }
+
+
+@router.get("/health/ready")
+def health_ready(response: Response) -> dict:
+    pronto = aplicacao_pronta()
+    if not pronto:
+        response.status_code = 503
+    return {"status": "pronto" if pronto else "aquecendo", **relatorio_inicializacao()}
@@ -0,0 +1,91 @@
+from contextlib import contextmanager
+from datetime import datetime
+import importlib
+import logging
+from threading import Event, Lock, Thread
+import time
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_importacoes: dict[str, float] = {}
+_etapas: dict[str, float] = {}
+_registro_lock = Lock()
+_iniciado_em = datetime.now()
+_pronto_em: Optional[datetime] = None
+_erro_aquecimento: Optional[str] = None
+
+_aquecimento_thread: Optional[Thread] = None
+_aquecimento_concluido = Event()
+
+
+def _decorrido_ms(inicio: float) -> float:
+    return round((time.perf_counter() - inicio) * 1000, 2)
+
+
+def importar(modulo: str):
+    inicio = time.perf_counter()
+    resultado = importlib.import_module(modulo)
+    with _registro_lock:
+        _importacoes.setdefault(modulo, _decorrido_ms(inicio))
+    return resultado
+
+
+@contextmanager
+def etapa(nome: str) -> Iterator[None]:
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _registro_lock:
+            _etapas[nome] = _decorrido_ms(inicio)
+
+
+def _aquecer(passos: list[tuple[str, Callable[[], object]]]) -> None:
+    global _pronto_em, _erro_aquecimento
+
+    inicio = time.perf_counter()
+    try:
+        for nome, passo in passos:
+            with etapa(nome):
+                passo()
+    except Exception as exc:
+        _erro_aquecimento = str(exc)
+        logger.exception("Falha no aquecimento da aplicacao")
+        return
+    finally:
+        _aquecimento_concluido.set()
+
+    _pronto_em = datetime.now()
+    logger.info("Aplicacao pronta em %.1f ms: %s", _decorrido_ms(inicio), relatorio_inicializacao())
+
+
+def iniciar_aquecimento(passos: list[tuple[str, Callable[[], object]]]) -> None:
+    global _aquecimento_thread
+
+    if _aquecimento_thread is not None and _aquecimento_thread.is_alive():
+        return
+    _aquecimento_concluido.clear()
+    _aquecimento_thread = Thread(target=_aquecer, args=(passos,), name="aquecimento", daemon=True)
+    _aquecimento_thread.start()
+
+
+def aguardar_aquecimento(timeout: Optional[float] = None) -> bool:
+    return _aquecimento_concluido.wait(timeout)
+
+
+def aplicacao_pronta() -> bool:
+    return _pronto_em is not None
+
+
+def relatorio_inicializacao() -> dict:
+    with _registro_lock:
+        importacoes = dict(_importacoes)
+        etapas = dict(_etapas)
+    return {
+        "iniciado_em": _iniciado_em.isoformat(),
+        "pronto_em": _pronto_em.isoformat() if _pronto_em else None,
+        "erro": _erro_aquecimento,
+        "importacoes_ms": importacoes,
+        "etapas_ms": etapas,
+    }
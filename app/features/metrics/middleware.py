@@ -0,0 +1,35 @@
+import time
+
+from app.features.metrics.service import HTTP_REQUISICAO_SEGUNDOS
+
+ROTA_DESCONHECIDA = "desconhecida"
+
+
+class MetricasMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        status = 500
+
+        async def _send(mensagem) -> None:
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            rota = scope.get("route")
+            HTTP_REQUISICAO_SEGUNDOS.observar(
+                time.perf_counter() - inicio,
+                scope["method"],
+                getattr(rota, "path", ROTA_DESCONHECIDA),
+                status,
+            )
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.features.metrics.service import exportar_metricas
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    return Response(content=exportar_metricas(), media_type="text/plain; version=0.0.4; charset=utf-8")
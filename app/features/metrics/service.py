@@ -0,0 +1,143 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+import time
+from typing import Callable, Iterator
+
+BUCKETS_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_BYTES = (4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+_metricas: list["_Metrica"] = []
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatar_rotulos(nomes: tuple[str, ...], valores: tuple, extra: str = "") -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _formatar_numero(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nome: str, ajuda: str, rotulos: tuple[str, ...] = ()) -> None:
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = rotulos
+        self._lock = Lock()
+        _metricas.append(self)
+
+    def _amostras(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def exportar(self) -> str:
+        linhas = [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+        linhas.extend(self._amostras())
+        return "\n".join(linhas)
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: tuple[str, ...] = ()) -> None:
+        super().__init__(nome, ajuda, rotulos)
+        self._valores: dict[tuple, float] = {} if rotulos else {(): 0}
+
+    def incrementar(self, *rotulos, valor: float = 1) -> None:
+        with self._lock:
+            self._valores[rotulos] = self._valores.get(rotulos, 0) + valor
+
+    def _amostras(self) -> Iterator[str]:
+        with self._lock:
+            valores = list(self._valores.items())
+        for rotulos, valor in valores:
+            yield f"{self.nome}{_formatar_rotulos(self.rotulos, rotulos)} {_formatar_numero(valor)}"
+
+
+class Medidor(_Metrica):
+    tipo = "gauge"
+
+    def __init__(self, nome: str, ajuda: str, funcao: Callable[[], float]) -> None:
+        super().__init__(nome, ajuda)
+        self._funcao = funcao
+
+    def _amostras(self) -> Iterator[str]:
+        yield f"{self.nome} {_formatar_numero(self._funcao())}"
+
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    def __init__(
+        self,
+        nome: str,
+        ajuda: str,
+        rotulos: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = BUCKETS_LATENCIA,
+    ) -> None:
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}
+
+    def observar(self, valor: float, *rotulos) -> None:
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(rotulos)
+            if serie is None:
+                serie = self._series[rotulos] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    @contextmanager
+    def cronometrar(self, *rotulos) -> Iterator[None]:
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, *rotulos)
+
+    def _amostras(self) -> Iterator[str]:
+        with self._lock:
+            series = [(rotulos, list(contagens), soma) for rotulos, (contagens, soma) in self._series.items()]
+        for rotulos, contagens, soma in series:
+            acumulado = 0
+            for limite, contagem in zip(self.buckets + (float("inf"),), contagens):
+                acumulado += contagem
+                le = 'le="' + _formatar_numero(limite) + '"'
+                yield f"{self.nome}_bucket{_formatar_rotulos(self.rotulos, rotulos, le)} {acumulado}"
+            yield f"{self.nome}_sum{_formatar_rotulos(self.rotulos, rotulos)} {_formatar_numero(soma)}"
+            yield f"{self.nome}_count{_formatar_rotulos(self.rotulos, rotulos)} {acumulado}"
+
+
+HTTP_REQUISICAO_SEGUNDOS = Histograma(
+    "quio_http_requisicao_segundos", "Latencia das requisicoes HTTP por rota", ("metodo", "rota", "status")
+)
+CHAT_MENSAGEM_SEGUNDOS = Histograma(
+    "quio_chat_mensagem_segundos", "Tempo de processamento de uma mensagem por estado da conversa", ("estado",)
+)
+CATALOGO_BUSCA_SEGUNDOS = Histograma(
+    "quio_catalogo_busca_segundos", "Tempo das buscas no catalogo", ("operacao",)
+)
+CATALOGO_CARGA_SEGUNDOS = Histograma(
+    "quio_catalogo_carga_segundos",
+    "Tempo de carga do catalogo por origem",
+    ("origem",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0),
+)
+CATALOGO_LEITURAS_EXCEL = Contador("quio_catalogo_leituras_excel_total", "Leituras da planilha de catalogo")
+PDF_RENDERIZACAO_SEGUNDOS = Histograma("quio_pdf_renderizacao_segundos", "Tempo de renderizacao de um PDF")
+PDF_BYTES = Histograma("quio_pdf_bytes", "Tamanho dos PDFs gerados", buckets=BUCKETS_BYTES)
+
+
+def exportar_metricas() -> str:
+    return "\n".join(metrica.exportar() for metrica in list(_metricas)) + "\n"
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+import heapq
+import math
+import re
+from typing import Iterable
+
+from app.domain.models import Movel
+from app.domain.texto import normalizar
+
+PESO_NOME = 1.0
+PESO_DESCRICAO = 0.5
+SIMILARIDADE_MINIMA = 0.3
+SCORE_MINIMO = 0.35
+# Limites da busca: tokens parecidos aceitos por token digitado e moveis pontuados
+# por consulta (os mais raros primeiro; cada token parecido contribui com ao menos
+# MIN_POSTINGS_TOKEN moveis, em ordem de impacto).
+MAX_SEMELHANTES = 8
+MAX_CANDIDATOS = 128
+MIN_POSTINGS_TOKEN = 16
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class ResultadoBusca:
+    movel: Movel
+    score: float
+    exato: bool
+
+
+def _tokenizar(texto: str) -> list[str]:
+    return [normalizar(t) for t in _TOKEN_RE.findall(normalizar(texto))]
+
+
+def _trigramas(token: str) -> frozenset[str]:
+    padded = f"  {token} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class IndiceBusca:
+    def __init__(self, moveis: Iterable[Movel]) -> None:
+        self._moveis = tuple(moveis)
+        self._nomes = tuple(normalizar(m.nome) for m in self._moveis)
+        self._postings: dict[str, dict[int, float]] = {}
+        self._trigramas_token: dict[str, frozenset[str]] = {}
+        self._tokens_por_trigrama: dict[str, set[str]] = {}
+
+        self._por_nome: dict[str, int] = {}
+
+        for pos, movel in enumerate(self._moveis):
+            self._por_nome.setdefault(self._nomes[pos], pos)
+            for token in _tokenizar(movel.descricao):
+                self._indexar_token(token, pos, PESO_DESCRICAO)
+            for token in _tokenizar(movel.nome):
+                self._indexar_token(token, pos, PESO_NOME)
+
+        total = len(self._moveis)
+        self._idf_maximo = math.log(1 + total)
+        self._idf = {token: math.log(1 + total / len(postings)) for token, postings in self._postings.items()}
+        self._por_impacto = {
+            token: tuple(sorted(postings, key=lambda pos: (-postings[pos], len(self._nomes[pos]), pos)))
+            for token, postings in self._postings.items()
+        }
+
+    def _indexar_token(self, token: str, pos: int, peso: float) -> None:
+        postings = self._postings.setdefault(token, {})
+        postings[pos] = max(peso, postings.get(pos, 0.0))
+
+        if token not in self._trigramas_token:
+            trigramas = _trigramas(token)
+            self._trigramas_token[token] = trigramas
+            for trigrama in trigramas:
+                self._tokens_por_trigrama.setdefault(trigrama, set()).add(token)
+
+    def _tokens_semelhantes(self, token: str) -> dict[str, float]:
+        if token in self._postings:
+            return {token: 1.0}
+
+        trigramas = _trigramas(token)
+        compartilhados: dict[str, int] = {}
+        for trigrama in trigramas:
+            for candidato in self._tokens_por_trigrama.get(trigrama, ()):
+                compartilhados[candidato] = compartilhados.get(candidato, 0) + 1
+
+        semelhantes = []
+        for candidato, qtd in compartilhados.items():
+            similaridade = qtd / (len(trigramas) + len(self._trigramas_token[candidato]) - qtd)
+            if similaridade >= SIMILARIDADE_MINIMA:
+                semelhantes.append((similaridade, candidato))
+        return {candidato: similaridade for similaridade, candidato in heapq.nlargest(MAX_SEMELHANTES, semelhantes)}
+
+    def _candidatos(self, expansoes: list[dict[str, float]]) -> set[int]:
+        semelhantes = sorted({t for expansao in expansoes for t in expansao}, key=lambda t: len(self._postings[t]))
+        candidatos: set[int] = set()
+        for token in semelhantes:
+            quantidade = max(MAX_CANDIDATOS - len(candidatos), MIN_POSTINGS_TOKEN)
+            candidatos.update(self._por_impacto[token][:quantidade])
+        return candidatos
+
+    def buscar(self, termo: str, limite: int = 5) -> list[ResultadoBusca]:
+        termo_normalizado = normalizar(termo)
+        tokens = _tokenizar(termo)
+        if not tokens:
+            return []
+
+        semelhantes = [self._tokens_semelhantes(token) for token in tokens]
+        expansoes = [[(self._postings[t], similaridade) for t, similaridade in s.items()] for s in semelhantes]
+        pesos = [max((sim * self._idf[t] for t, sim in s.items()), default=self._idf_maximo) for s in semelhantes]
+        peso_total = sum(pesos)
+
+        candidatos = self._candidatos(semelhantes)
+        exato_pos = self._por_nome.get(termo_normalizado)
+        if exato_pos is not None:
+            candidatos.add(exato_pos)
+
+        resultados = []
+        for pos in candidatos:
+            pontos = 0.0
+            for expansao, peso_token in zip(expansoes, pesos):
+                melhor = 0.0
+                for postings, similaridade in expansao:
+                    peso = postings.get(pos)
+                    if peso is not None and similaridade * peso > melhor:
+                        melhor = similaridade * peso
+                pontos += peso_token * melhor
+            nome = self._nomes[pos]
+            score = pontos / peso_total
+            exato = termo_normalizado == nome
+            if exato:
+                score += 2.0
+            elif termo_normalizado in nome:
+                score += 1.0 + 0.1 * len(termo_normalizado) / len(nome)
+
+            if score >= SCORE_MINIMO:
+                resultados.append((score, -pos, exato))
+
+        melhores = heapq.nlargest(limite, resultados)
+        return [ResultadoBusca(self._moveis[-pos], round(score, 4), exato) for score, pos, exato in melhores]
@@ -1,89 +1,41 @@
-from pathlib import Path
-
-import pandas as pd
+from typing import Mapping, Optional
 
 from app.domain.models import Componente, Movel
-from app.config.settings import EXCEL_FILE
-from app.features.chat.helpers_tabbles import normalizar
-
-
-def _parse_preco(valor) -> float:
-    if pd.isna(valor):
-        return 0.0
-
-    valor = str(valor).strip()
-
-    if "." in valor and "," in valor:
-        valor = valor.replace(".", "").replace(",", ".")
-    elif "," in valor:
-        valor = valor.replace(",", ".")
-
-    return float(valor)
-
-
-def _load_sheet(sheet_name: str) -> pd.DataFrame:
-    excel_path = Path(EXCEL_FILE)
-    if not excel_path.exists():
-        raise FileNotFoundError(f"Arquivo de catalogo nao encontrado: {excel_path}")
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
-    df.columns = [c.strip().lower() for c in df.columns]
-    return df
-
-
-def buscar_movel_por_nome(nome: str):
-    df = _load_sheet("balcoes")
-    termo_busca = normalizar(nome)
-
-    for _, r in df.iterrows():
-        nome_catalogo = normalizar(str(r["nome"]))
-        if termo_busca in nome_catalogo:
-            return Movel(
-                r["id"],
-                r["nome"],
-                r["tipo"],
-                r["material"],
-                r["cor"],
-                _parse_preco(r["preco_base"]),
-                r["l_mm"],
-                r["a_mm"],
-                r["p_mm"],
-                r["area"],
-                r["descricao"],
-            )
-    return None
-
-
-def buscar_componentes_do_movel(movel_id: int) -> list[Componente]:
-    df = _load_sheet("componentes")
-
-    componentes = []
-    for _, r in df[df["balcao_id"] == movel_id].iterrows():
-        componentes.append(
-            Componente(
-                nome=r["nome"],
-                categoria_funcional=r["categoria_funcional"],
-                quantidade=int(r["quantidade"]),
-                preco_unitario=_parse_preco(r["preco_unitario"]),
-                material=r.get("material"),
-                cor=r.get("cor"),
-            )
-        )
-
-    return componentes
-
-
-def buscar_catalogo_componentes() -> dict[str, list[dict]]:
-    df = _load_sheet("catalogo_componentes")
-
-    catalogo = {}
-    for _, r in df.iterrows():
-        categoria = normalizar(str(r["categoria_funcional"]))
-        catalogo.setdefault(categoria, []).append(
-            {
-                "id": str(r["id"]),
-                "nome": r["nome"],
-                "preco_unitario": _parse_preco(r["preco_unitario"]),
-            }
-        )
-
-    return catalogo
+from app.features.metrics.service import CATALOGO_BUSCA_SEGUNDOS
+from app.features.orcamento.catalogo.catalogo_busca import ResultadoBusca
+from app.features.orcamento.catalogo.catalogo_snapshot import obter_snapshot
+
+
+def buscar_moveis_por_nome(nome: str, limite: int = 5, versao: Optional[int] = None) -> list[ResultadoBusca]:
+    with CATALOGO_BUSCA_SEGUNDOS.cronometrar("moveis_por_nome"):
+        return obter_snapshot(versao).indice_busca.buscar(nome, limite)
+
+
+def buscar_movel_por_nome(nome: str, versao: Optional[int] = None):
+    resultados = buscar_moveis_por_nome(nome, limite=1, versao=versao)
+    return resultados[0].movel if resultados else None
+
+
+def buscar_movel_por_id(movel_id: int, versao: Optional[int] = None):
+    return obter_snapshot(versao).moveis_por_id.get(movel_id)
+
+
+def buscar_componentes_do_movel(movel_id: int, versao: Optional[int] = None) -> list[Componente]:
+    return list(obter_snapshot(versao).componentes_por_movel.get(movel_id, ()))
+
+
+def movel_compartilhado(movel: Movel, versao: Optional[int] = None) -> Movel:
+    existente = obter_snapshot(versao).moveis_por_id.get(movel.id)
+    return existente if existente == movel else movel
+
+
+def componente_compartilhado(componente: Componente, versao: Optional[int] = None) -> Componente:
+    return obter_snapshot(versao).componentes_compartilhados.get(componente, componente)
+
+
+def buscar_opcao_componente(categoria: str, opcao_id: str, versao: Optional[int] = None) -> Optional[dict]:
+    return obter_snapshot(versao).opcoes_por_id.get(categoria, {}).get(opcao_id)
+
+
+def buscar_catalogo_componentes(versao: Optional[int] = None) -> Mapping[str, tuple[dict, ...]]:
+    return obter_snapshot(versao).catalogo_componentes
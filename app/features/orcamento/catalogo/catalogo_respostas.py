@@ -0,0 +1,40 @@
+import json
+from threading import Lock
+from typing import Callable, Hashable, Optional, TypeVar
+
+from fastapi.responses import Response
+
+from app.features.orcamento.catalogo.catalogo_snapshot import CatalogoSnapshot, obter_snapshot, versoes_retidas
+
+T = TypeVar("T")
+
+_AUSENTE = object()
+
+_cache: dict[tuple[int, Hashable], object] = {}
+_cache_lock = Lock()
+
+
+def json_bytes(conteudo) -> bytes:
+    return json.dumps(conteudo, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def resposta_json(corpo: bytes) -> Response:
+    return Response(content=corpo, media_type="application/json")
+
+
+def _descartar_versoes_antigas() -> None:
+    retidas = set(versoes_retidas())
+    for chave in [chave for chave in _cache if chave[0] not in retidas]:
+        del _cache[chave]
+
+
+def memorizar(versao: Optional[int], chave: Hashable, construir: Callable[[CatalogoSnapshot], T]) -> T:
+    snapshot = obter_snapshot(versao)
+    item = _cache.get((snapshot.versao, chave), _AUSENTE)
+    if item is not _AUSENTE:
+        return item
+
+    item = construir(snapshot)
+    with _cache_lock:
+        _descartar_versoes_antigas()
+        return _cache.setdefault((snapshot.versao, chave), item)
@@ -0,0 +1,439 @@
+from collections import OrderedDict
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+import hashlib
+import logging
+import os
+from pathlib import Path
+import pickle
+import sys
+from threading import Event, Lock, Thread
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Mapping, Optional
+
+from app.config.settings import CATALOGO_USAR_COMPILADO, CATALOGO_VERSOES_RETIDAS, EXCEL_FILE
+from app.domain.models import Componente, Movel
+from app.domain.texto import normalizar
+from app.features.metrics.service import CATALOGO_CARGA_SEGUNDOS, CATALOGO_LEITURAS_EXCEL
+from app.features.orcamento.catalogo.catalogo_busca import IndiceBusca
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ABAS_CATALOGO = ("balcoes", "componentes", "catalogo_componentes")
+
+# Incrementar quando CatalogoSnapshot ou os modelos mudarem, para invalidar
+# catalogos compilados com a estrutura antiga.
+FORMATO_COMPILADO = 2
+
+
+@dataclass(frozen=True)
+class CatalogoSnapshot:
+    moveis: tuple[Movel, ...]
+    moveis_por_id: Mapping[int, Movel]
+    moveis_por_nome: Mapping[str, Movel]
+    componentes_por_movel: Mapping[int, tuple[Componente, ...]]
+    catalogo_componentes: Mapping[str, tuple[dict, ...]]
+    opcoes_por_id: Mapping[str, Mapping[str, dict]]
+    componentes_compartilhados: Mapping[Componente, Componente]
+    indice_busca: IndiceBusca
+    versao: int = 0
+    origem_hash: str = ""
+    carregado_em: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class _AssinaturaArquivo:
+    mtime_ns: int
+    tamanho: int
+
+
+_snapshot: Optional[CatalogoSnapshot] = None
+_historico: "OrderedDict[int, CatalogoSnapshot]" = OrderedDict()
+_snapshot_lock = Lock()
+_recarga_lock = Lock()
+_assinatura: Optional[_AssinaturaArquivo] = None
+_ultima_verificacao: Optional[datetime] = None
+_ultimo_erro: Optional[str] = None
+
+_monitor_thread: Optional[Thread] = None
+_monitor_parar = Event()
+
+
+def _parse_precos(valores: "pd.Series") -> list[float]:
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(valores):
+        return valores.fillna(0.0).astype(float).tolist()
+
+    texto = valores.where(valores.notna(), "0").astype(str).str.strip()
+    milhar = texto.str.contains(".", regex=False) & texto.str.contains(",", regex=False)
+    texto = texto.mask(milhar, texto.str.replace(".", "", regex=False)).str.replace(",", ".", regex=False)
+    return pd.to_numeric(texto).astype(float).tolist()
+
+
+def _textos(valores: "pd.Series") -> list[str]:
+    return [sys.intern(v) for v in valores.astype(str).tolist()]
+
+
+def _textos_opcionais(df: "pd.DataFrame", coluna: str) -> list[Optional[str]]:
+    if coluna not in df.columns:
+        return [None] * len(df)
+    vazios = df[coluna].isna().tolist()
+    return [None if vazio else texto for vazio, texto in zip(vazios, _textos(df[coluna]))]
+
+
+def _categorias_normalizadas(valores: "pd.Series") -> list[str]:
+    brutas = valores.astype(str)
+    mapa = {valor: sys.intern(normalizar(valor)) for valor in brutas.unique()}
+    return brutas.map(mapa).tolist()
+
+
+def _load_sheets(excel_path: Path) -> "dict[str, pd.DataFrame]":
+    import pandas as pd
+
+    if not excel_path.exists():
+        raise FileNotFoundError(f"Arquivo de catalogo nao encontrado: {excel_path}")
+
+    CATALOGO_LEITURAS_EXCEL.incrementar()
+    sheets = pd.read_excel(excel_path, sheet_name=list(ABAS_CATALOGO))
+    for df in sheets.values():
+        df.columns = [str(c).strip().lower() for c in df.columns]
+    return sheets
+
+
+def _construir_moveis(df: "pd.DataFrame") -> tuple[Movel, ...]:
+    return tuple(
+        map(
+            Movel,
+            df["id"].astype(int).tolist(),
+            _textos(df["nome"]),
+            _textos(df["tipo"]),
+            _textos(df["material"]),
+            _textos(df["cor"]),
+            _parse_precos(df["preco_base"]),
+            df["l_mm"].astype(float).tolist(),
+            df["a_mm"].astype(float).tolist(),
+            df["p_mm"].astype(float).tolist(),
+            df["area"].astype(float).tolist(),
+            _textos(df["descricao"]),
+        )
+    )
+
+
+def _construir_componentes(df: "pd.DataFrame") -> dict[int, tuple[Componente, ...]]:
+    linhas = zip(
+        _textos(df["nome"]),
+        _textos(df["categoria_funcional"]),
+        df["quantidade"].astype(int).tolist(),
+        _parse_precos(df["preco_unitario"]),
+        _textos_opcionais(df, "material"),
+        _textos_opcionais(df, "cor"),
+    )
+
+    unicos: dict[tuple, Componente] = {}
+    agrupados: dict[int, list[Componente]] = {}
+    for balcao_id, linha in zip(df["balcao_id"].astype(int).tolist(), linhas):
+        componente = unicos.get(linha)
+        if componente is None:
+            componente = unicos[linha] = Componente(*linha)
+        agrupados.setdefault(balcao_id, []).append(componente)
+    return {balcao_id: tuple(itens) for balcao_id, itens in agrupados.items()}
+
+
+def _construir_catalogo_componentes(df: "pd.DataFrame") -> dict[str, tuple[dict, ...]]:
+    catalogo: dict[str, list[dict]] = {}
+    colunas = zip(
+        _categorias_normalizadas(df["categoria_funcional"]),
+        _textos(df["id"]),
+        _textos(df["nome"]),
+        _parse_precos(df["preco_unitario"]),
+    )
+    for categoria, opcao_id, nome, preco in colunas:
+        catalogo.setdefault(categoria, []).append({"id": opcao_id, "nome": nome, "preco_unitario": preco})
+    return {categoria: tuple(opcoes) for categoria, opcoes in catalogo.items()}
+
+
+def _indexar_opcoes(catalogo_componentes: dict[str, tuple[dict, ...]]) -> dict[str, dict[str, dict]]:
+    indice: dict[str, dict[str, dict]] = {}
+    for categoria, opcoes in catalogo_componentes.items():
+        por_id = indice[categoria] = {}
+        for opcao in opcoes:
+            por_id.setdefault(str(opcao["id"]), opcao)
+    return indice
+
+
+def _mapear_compartilhados(
+    componentes_por_movel: dict[int, tuple[Componente, ...]],
+    catalogo_componentes: dict[str, tuple[dict, ...]],
+) -> dict[Componente, Componente]:
+    compartilhados: dict[Componente, Componente] = {}
+    for componentes in componentes_por_movel.values():
+        for componente in componentes:
+            compartilhados.setdefault(componente, componente)
+
+    for categoria, opcoes in catalogo_componentes.items():
+        for opcao in opcoes:
+            componente = Componente(
+                nome=opcao["nome"],
+                categoria_funcional=categoria,
+                quantidade=1,
+                preco_unitario=opcao["preco_unitario"],
+            )
+            compartilhados.setdefault(componente, componente)
+    return compartilhados
+
+
+def construir_snapshot(sheets: "dict[str, pd.DataFrame]") -> CatalogoSnapshot:
+    moveis = _construir_moveis(sheets["balcoes"])
+    componentes_por_movel = _construir_componentes(sheets["componentes"])
+    catalogo_componentes = _construir_catalogo_componentes(sheets["catalogo_componentes"])
+
+    moveis_por_nome: dict[str, Movel] = {}
+    for movel in moveis:
+        moveis_por_nome.setdefault(normalizar(movel.nome), movel)
+
+    return CatalogoSnapshot(
+        moveis=moveis,
+        moveis_por_id=MappingProxyType({movel.id: movel for movel in moveis}),
+        moveis_por_nome=MappingProxyType(moveis_por_nome),
+        componentes_por_movel=MappingProxyType(componentes_por_movel),
+        catalogo_componentes=MappingProxyType(catalogo_componentes),
+        opcoes_por_id=MappingProxyType(_indexar_opcoes(catalogo_componentes)),
+        componentes_compartilhados=MappingProxyType(
+            _mapear_compartilhados(componentes_por_movel, catalogo_componentes)
+        ),
+        indice_busca=IndiceBusca(moveis),
+    )
+
+
+def _assinatura_arquivo(excel_path: Path) -> _AssinaturaArquivo:
+    stat = excel_path.stat()
+    return _AssinaturaArquivo(mtime_ns=stat.st_mtime_ns, tamanho=stat.st_size)
+
+
+def _hash_arquivo(excel_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(excel_path, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1024 * 1024), b""):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+def caminho_compilado(excel_path: Path) -> Path:
+    return Path(excel_path).with_suffix(".catalogo")
+
+
+def _campos_dados() -> tuple[str, ...]:
+    return tuple(f.name for f in fields(CatalogoSnapshot) if f.name not in ("versao", "origem_hash", "carregado_em"))
+
+
+def _dados_snapshot(snapshot: CatalogoSnapshot) -> dict:
+    dados = {}
+    for campo in _campos_dados():
+        valor = getattr(snapshot, campo)
+        dados[campo] = dict(valor) if isinstance(valor, MappingProxyType) else valor
+    return dados
+
+
+def _gravar_compilado(snapshot: CatalogoSnapshot, destino: Path) -> None:
+    conteudo = {"formato": FORMATO_COMPILADO, "origem_hash": snapshot.origem_hash, "dados": _dados_snapshot(snapshot)}
+    temporario = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+    with open(temporario, "wb") as arquivo:
+        pickle.dump(conteudo, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporario, destino)
+
+
+def _ler_compilado(caminho: Path, origem_hash: str) -> Optional[CatalogoSnapshot]:
+    try:
+        with open(caminho, "rb") as arquivo:
+            conteudo = pickle.load(arquivo)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning("Catalogo compilado invalido em %s; usando a planilha", caminho, exc_info=True)
+        return None
+
+    if conteudo.get("formato") != FORMATO_COMPILADO or conteudo.get("origem_hash") != origem_hash:
+        logger.info("Catalogo compilado %s desatualizado; usando a planilha", caminho)
+        return None
+
+    dados = {
+        campo: MappingProxyType(valor) if isinstance(valor, dict) else valor
+        for campo, valor in conteudo["dados"].items()
+    }
+    return CatalogoSnapshot(**dados, origem_hash=origem_hash)
+
+
+def compilar_catalogo(excel_path: Path = EXCEL_FILE, destino: Optional[Path] = None) -> Path:
+    excel_path = Path(excel_path)
+    destino = Path(destino) if destino else caminho_compilado(excel_path)
+    snapshot = replace(construir_snapshot(_load_sheets(excel_path)), origem_hash=_hash_arquivo(excel_path))
+    _gravar_compilado(snapshot, destino)
+    return destino
+
+
+def _snapshot_da_origem(excel_path: Path, origem_hash: str) -> CatalogoSnapshot:
+    compilado = caminho_compilado(excel_path)
+    if CATALOGO_USAR_COMPILADO and origem_hash:
+        inicio = time.perf_counter()
+        snapshot = _ler_compilado(compilado, origem_hash)
+        if snapshot is not None:
+            CATALOGO_CARGA_SEGUNDOS.observar(time.perf_counter() - inicio, "compilado")
+            logger.info("Catalogo carregado de %s", compilado)
+            return snapshot
+
+    with CATALOGO_CARGA_SEGUNDOS.cronometrar("excel"):
+        snapshot = replace(construir_snapshot(_load_sheets(excel_path)), origem_hash=origem_hash)
+    if CATALOGO_USAR_COMPILADO and origem_hash:
+        try:
+            _gravar_compilado(snapshot, compilado)
+        except OSError as exc:
+            logger.warning("Nao foi possivel gravar o catalogo compilado em %s: %s", compilado, exc)
+    return snapshot
+
+
+def carregar_snapshot(excel_path: Path = EXCEL_FILE) -> CatalogoSnapshot:
+    excel_path = Path(excel_path)
+    origem_hash = _hash_arquivo(excel_path) if excel_path.exists() else ""
+    return _snapshot_da_origem(excel_path, origem_hash)
+
+
+def _versao_do_hash(origem_hash: str) -> int:
+    # Derivada do conteudo: o mesmo catalogo tem a mesma versao em todos os workers e reinicios.
+    # 52 bits para caber sem perda em numeros do JavaScript.
+    return int(origem_hash[:13], 16)
+
+
+def _instalar(snapshot: CatalogoSnapshot) -> CatalogoSnapshot:
+    global _snapshot
+
+    if not snapshot.origem_hash:
+        conteudo = pickle.dumps(_dados_snapshot(snapshot), protocol=pickle.HIGHEST_PROTOCOL)
+        snapshot = replace(snapshot, origem_hash=hashlib.sha256(conteudo).hexdigest())
+
+    versao = _versao_do_hash(snapshot.origem_hash)
+    if _snapshot is not None and _snapshot.versao == versao:
+        return _snapshot
+
+    snapshot = replace(snapshot, versao=versao, carregado_em=datetime.now())
+    _historico.pop(versao, None)
+    _historico[versao] = snapshot
+    while len(_historico) > CATALOGO_VERSOES_RETIDAS:
+        _historico.popitem(last=False)
+    _snapshot = snapshot
+
+    logger.info("Catalogo versao %s carregado (%s)", snapshot.versao, snapshot.origem_hash[:12])
+    return snapshot
+
+
+def instalar_snapshot(snapshot: CatalogoSnapshot) -> CatalogoSnapshot:
+    with _snapshot_lock:
+        return _instalar(snapshot)
+
+
+def obter_snapshot(versao: Optional[int] = None) -> CatalogoSnapshot:
+    global _assinatura
+
+    if versao is not None:
+        snapshot = _historico.get(versao)
+        if snapshot is not None:
+            return snapshot
+
+    snapshot = _snapshot
+    if snapshot is not None:
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot is not None:
+            return _snapshot
+        excel_path = Path(EXCEL_FILE)
+        _assinatura = _assinatura_arquivo(excel_path) if excel_path.exists() else None
+        return _instalar(carregar_snapshot(excel_path))
+
+
+def versao_atual_catalogo() -> int:
+    return obter_snapshot().versao
+
+
+def recarregar_se_alterado(forcar: bool = False) -> bool:
+    with _recarga_lock:
+        return _recarregar_se_alterado(forcar)
+
+
+def _recarregar_se_alterado(forcar: bool) -> bool:
+    global _assinatura, _ultima_verificacao, _ultimo_erro
+
+    excel_path = Path(EXCEL_FILE)
+    _ultima_verificacao = datetime.now()
+
+    try:
+        assinatura = _assinatura_arquivo(excel_path)
+        if not forcar and assinatura == _assinatura:
+            return False
+
+        atual = _snapshot
+        origem_hash = _hash_arquivo(excel_path)
+        if atual is not None and origem_hash == atual.origem_hash:
+            _assinatura = assinatura
+            return False
+
+        novo = _snapshot_da_origem(excel_path, origem_hash)
+    except Exception as exc:
+        _ultimo_erro = str(exc)
+        logger.exception("Falha ao recarregar catalogo %s", excel_path)
+        return False
+
+    _assinatura = assinatura
+    _ultimo_erro = None
+    instalar_snapshot(novo)
+    return True
+
+
+def _loop_monitor(intervalo: float) -> None:
+    while not _monitor_parar.wait(intervalo):
+        recarregar_se_alterado()
+
+
+def iniciar_monitor_catalogo(intervalo: float) -> None:
+    global _monitor_thread
+
+    if intervalo <= 0 or (_monitor_thread is not None and _monitor_thread.is_alive()):
+        return
+
+    _monitor_parar.clear()
+    _monitor_thread = Thread(target=_loop_monitor, args=(intervalo,), name="catalogo-monitor", daemon=True)
+    _monitor_thread.start()
+
+
+def parar_monitor_catalogo() -> None:
+    global _monitor_thread
+
+    _monitor_parar.set()
+    if _monitor_thread is not None:
+        _monitor_thread.join(timeout=5)
+    _monitor_thread = None
+
+
+def versoes_retidas() -> tuple[int, ...]:
+    with _snapshot_lock:
+        return tuple(_historico)
+
+
+def status_catalogo() -> dict:
+    snapshot = obter_snapshot()
+
+    return {
+        "versao": snapshot.versao,
+        "hash": snapshot.origem_hash,
+        "carregado_em": snapshot.carregado_em.isoformat() if snapshot.carregado_em else None,
+        "ultima_verificacao": _ultima_verificacao.isoformat() if _ultima_verificacao else None,
+        "ultimo_erro": _ultimo_erro,
+        "versoes_retidas": list(versoes_retidas()),
+        "monitor_ativo": _monitor_thread is not None and _monitor_thread.is_alive(),
+        "qtd_moveis": len(snapshot.moveis),
+        "qtd_categorias": len(snapshot.catalogo_componentes),
+    }
@@ -0,0 +1,21 @@
+import argparse
+from pathlib import Path
+import time
+
+from app.config.settings import EXCEL_FILE
+from app.features.orcamento.catalogo.catalogo_snapshot import compilar_catalogo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compila a planilha de catalogo para carga rapida")
+    parser.add_argument("--excel", type=Path, default=EXCEL_FILE, help="planilha de origem")
+    parser.add_argument("--saida", type=Path, default=None, help="arquivo compilado (padrao: ao lado da planilha)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    destino = compilar_catalogo(args.excel, args.saida)
+    print(f"Catalogo compilado em {destino} ({(time.perf_counter() - inicio) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+from typing import Callable, Optional
+import uuid
+
+from app.config.settings import ORCAMENTOS_DIR, PDF_CACHE_MAX_ARQUIVOS
+
+CACHE_DIR = Path(ORCAMENTOS_DIR) / "cache"
+
+# Incrementar quando o layout do PDF mudar, para nao servir documentos antigos.
+VERSAO_LAYOUT = 2
+
+
+def _conteudo_orcamento(moveis_configurados) -> list:
+    return [
+        {
+            "nome": config.nome_movel,
+            "dim": [config.L_mm, config.A_mm, config.P_mm],
+            "material": config.material,
+            "cor": config.cor,
+            "preco": config.preco_atual,
+            "comp": [[c.nome, c.categoria_funcional, c.quantidade, c.preco_unitario] for c in config.componentes],
+        }
+        for config in moveis_configurados
+    ]
+
+
+def hash_orcamento(moveis_configurados) -> str:
+    conteudo = {"layout": VERSAO_LAYOUT, "moveis": _conteudo_orcamento(moveis_configurados)}
+    texto = json.dumps(conteudo, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def caminho_cache(chave: str) -> Path:
+    return CACHE_DIR / f"{chave}.pdf"
+
+
+def buscar_pdf_cache(chave: str) -> Optional[Path]:
+    caminho = caminho_cache(chave)
+    return caminho if caminho.is_file() else None
+
+
+def _limitar_cache() -> None:
+    if PDF_CACHE_MAX_ARQUIVOS <= 0:
+        return
+
+    try:
+        arquivos = sorted(CACHE_DIR.glob("*.pdf"), key=lambda p: p.stat().st_mtime)
+    except FileNotFoundError:
+        return
+    for antigo in arquivos[: max(len(arquivos) - PDF_CACHE_MAX_ARQUIVOS, 0)]:
+        antigo.unlink(missing_ok=True)
+
+
+def gravar_pdf_cache(chave: str, origem: Path) -> Path:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    destino = caminho_cache(chave)
+    temporario = CACHE_DIR / f"{chave}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        os.link(origem, temporario)
+    except OSError:
+        shutil.copyfile(origem, temporario)
+    os.replace(temporario, destino)
+
+    _limitar_cache()
+    return destino
+
+
+def renderizar_no_cache(chave: str, escrever: Callable[[str], None]) -> Path:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    destino = caminho_cache(chave)
+    temporario = CACHE_DIR / f"{chave}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        escrever(str(temporario))
+        os.replace(temporario, destino)
+    finally:
+        temporario.unlink(missing_ok=True)
+
+    _limitar_cache()
+    return destino
@@ -0,0 +1,221 @@
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from copy import deepcopy
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import multiprocessing
+from pathlib import Path
+from threading import Lock
+import time
+from typing import Callable, Iterable, Iterator, Optional
+import uuid
+
+from app.config.settings import ORCAMENTOS_DIR, PDF_WORKERS
+from app.features.metrics.service import PDF_BYTES, PDF_RENDERIZACAO_SEGUNDOS
+from app.features.orcamento.pdf.pdf_cache import buscar_pdf_cache, hash_orcamento, renderizar_no_cache
+
+logger = logging.getLogger(__name__)
+
+MAX_JOBS_RETIDOS = 1000
+
+STATUS_NA_FILA = "na_fila"
+STATUS_RENDERIZANDO = "renderizando"
+STATUS_CONCLUIDO = "concluido"
+STATUS_ERRO = "erro"
+
+_PROGRESSO = {STATUS_NA_FILA: 0, STATUS_RENDERIZANDO: 50, STATUS_CONCLUIDO: 100, STATUS_ERRO: 100}
+
+
+@dataclass
+class PdfJob:
+    id: str
+    session_id: str
+    criado_em: datetime
+    future: Future
+    concluido_em: Optional[datetime] = None
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return STATUS_RENDERIZANDO if self.future.running() else STATUS_NA_FILA
+        if self.future.cancelled():
+            return STATUS_ERRO
+        return STATUS_ERRO if self.future.exception() else STATUS_CONCLUIDO
+
+    @property
+    def filename(self) -> Optional[str]:
+        if self.status != STATUS_CONCLUIDO:
+            return None
+        return self.future.result()[0]
+
+    @property
+    def erro(self) -> Optional[str]:
+        if self.status != STATUS_ERRO:
+            return None
+        if self.future.cancelled():
+            return "Geracao cancelada"
+        return str(self.future.exception())
+
+    def para_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progresso": _PROGRESSO[self.status],
+            "filename": self.filename,
+            "erro": self.erro,
+            "criado_em": self.criado_em.isoformat(),
+            "concluido_em": self.concluido_em.isoformat() if self.concluido_em else None,
+        }
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_finalizador: Optional[ThreadPoolExecutor] = None
+_pool_lock = Lock()
+_jobs: "OrderedDict[str, PdfJob]" = OrderedDict()
+_jobs_lock = Lock()
+
+
+def _obter_pool() -> ProcessPoolExecutor:
+    global _pool, _finalizador
+
+    if _pool is None:
+        with _pool_lock:
+            if _finalizador is None:
+                _finalizador = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-finalizador")
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=max(PDF_WORKERS, 1),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _submeter(funcao, *args) -> Future:
+    try:
+        return _obter_pool().submit(funcao, *args)
+    except BrokenProcessPool:
+        logger.warning("Pool de PDF quebrado; recriando")
+        _descartar_pool()
+        return _obter_pool().submit(funcao, *args)
+
+
+def _registrar(job: PdfJob) -> None:
+    with _jobs_lock:
+        _jobs[job.id] = job
+        while len(_jobs) > MAX_JOBS_RETIDOS:
+            _jobs.popitem(last=False)
+
+
+def _registrar_renderizacao(segundos: Optional[float], tamanho: int) -> None:
+    if segundos is not None:
+        PDF_RENDERIZACAO_SEGUNDOS.observar(segundos)
+        PDF_BYTES.observar(tamanho)
+
+
+def _salvar_pdf(moveis_configurados, session_id: str) -> tuple[str, float, int]:
+    from app.features.orcamento.pdf.pdf_service import salvar_pdf_local
+
+    inicio = time.perf_counter()
+    filename = salvar_pdf_local(moveis_configurados, session_id)
+    segundos = time.perf_counter() - inicio
+    return filename, segundos, (Path(ORCAMENTOS_DIR) / filename).stat().st_size
+
+
+def enfileirar_pdf(
+    moveis_configurados,
+    session_id: str,
+    ao_concluir: Optional[Callable[[PdfJob], None]] = None,
+) -> PdfJob:
+    future = _submeter(_salvar_pdf, deepcopy(moveis_configurados), session_id)
+    job = PdfJob(id=uuid.uuid4().hex, session_id=session_id, criado_em=datetime.now(), future=future)
+    _registrar(job)
+
+    def _concluir(_: Future) -> None:
+        job.concluido_em = datetime.now()
+        if job.erro:
+            logger.error("Falha ao gerar PDF da sessao %s: %s", session_id, job.erro)
+        else:
+            _registrar_renderizacao(*job.future.result()[1:])
+        if ao_concluir is not None:
+            _finalizador.submit(ao_concluir, job)
+
+    future.add_done_callback(_concluir)
+    return job
+
+
+def _renderizar_cache(moveis_configurados, session_id: str) -> tuple[str, Optional[float], int]:
+    from app.features.orcamento.pdf.pdf_service import escrever_pdf_orcamento
+
+    chave = hash_orcamento(moveis_configurados)
+    caminho = buscar_pdf_cache(chave)
+    if caminho is not None:
+        return str(caminho), None, 0
+
+    inicio = time.perf_counter()
+    caminho = renderizar_no_cache(
+        chave, lambda destino: escrever_pdf_orcamento(moveis_configurados, session_id, destino)
+    )
+    segundos = time.perf_counter() - inicio
+    return str(caminho), segundos, caminho.stat().st_size
+
+
+def renderizar_para_cache(moveis_configurados, session_id: str) -> str:
+    caminho, segundos, tamanho = _renderizar_cache(moveis_configurados, session_id)
+    _registrar_renderizacao(segundos, tamanho)
+    return caminho
+
+
+def renderizar_lote(itens: Iterable[tuple[str, list]]) -> Iterator[tuple[str, Optional[Path], Optional[str]]]:
+    pendentes = iter(itens)
+    em_andamento: dict[Future, str] = {}
+    limite = max(PDF_WORKERS, 1) * 2
+
+    def _preencher() -> None:
+        while len(em_andamento) < limite:
+            proximo = next(pendentes, None)
+            if proximo is None:
+                return
+            session_id, moveis = proximo
+            em_andamento[_submeter(_renderizar_cache, moveis, session_id)] = session_id
+
+    _preencher()
+    while em_andamento:
+        concluidos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+        for future in concluidos:
+            session_id = em_andamento.pop(future)
+            if future.exception():
+                yield session_id, None, str(future.exception())
+            else:
+                caminho, segundos, tamanho = future.result()
+                _registrar_renderizacao(segundos, tamanho)
+                yield session_id, Path(caminho), None
+        _preencher()
+
+
+def obter_job(job_id: Optional[str]) -> Optional[PdfJob]:
+    if not job_id:
+        return None
+    return _jobs.get(job_id)
+
+
+def _descartar_pool() -> None:
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def encerrar_pool_pdf() -> None:
+    global _pool, _finalizador
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        if _finalizador is not None:
+            _finalizador.shutdown(wait=True)
+        _pool = None
+        _finalizador = None
@@ -1,88 +1,188 @@
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 import io
+import os
 from pathlib import Path
+from threading import Lock
+import uuid
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
-from reportlab.platypus import Image, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus import BaseDocTemplate, Flowable, Frame, Image, PageTemplate, Spacer, Table, TableStyle
 
 from app.config.settings import ORCAMENTOS_DIR
+from app.features.orcamento.pdf.pdf_cache import gravar_pdf_cache, hash_orcamento
+
+LOGOS_DIR = Path(__file__).resolve().parent / "logos"
+
+LARGURA_PAGINA, ALTURA_PAGINA = A4
+LARGURA_TABELA = 19 * cm
+X_TABELA = (LARGURA_PAGINA - LARGURA_TABELA) / 2
+MARGEM_LATERAL = 1.5 * cm
+MARGEM_SUPERIOR = 1.5 * cm
+MARGEM_INFERIOR = 1 * cm
+ALTURA_LINHA_INFO = 18
+
+ESTILO_CABECALHO = TableStyle(
+    [
+        ("ALIGN", (0, 0), (0, 0), "LEFT"),
+        ("ALIGN", (3, 0), (3, 0), "RIGHT"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("LEFTPADDING", (0, 0), (0, 0), 10),
+        ("RIGHTPADDING", (3, 0), (3, 0), 10),
+        ("TOPPADDING", (0, 0), (-1, -1), 10),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+        ("BOX", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+    ]
+)
+
+ESTILO_TITULO_CLIENTE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#f0f0f0")),
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 11),
+        ("LEFTPADDING", (0, 0), (-1, -1), 8),
+        ("TOPPADDING", (0, 0), (-1, -1), 6),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+        ("BOX", (0, 0), (-1, -1), 0.5, colors.grey),
+    ]
+)
+
+ESTILO_CLIENTE = TableStyle(
+    [
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("LEFTPADDING", (0, 0), (-1, -1), 8),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ]
+)
+
+ESTILO_PROJETO = TableStyle(
+    [
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (0, 0), 11),
+        ("FONTSIZE", (0, 1), (0, 1), 9),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("TOPPADDING", (0, 0), (-1, -1), 2),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+    ]
+)
+
+ESTILO_ITENS = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e0e0e0")),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 8),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("VALIGN", (0, 0), (-1, 0), "MIDDLE"),
+        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 1), (-1, -1), 8),
+        ("ALIGN", (0, 1), (1, -1), "CENTER"),
+        ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("BOX", (0, 0), (-1, -1), 1, colors.grey),
+        ("LEFTPADDING", (0, 0), (-1, -1), 4),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ]
+)
+
+ESTILO_TOTAL = TableStyle(
+    [
+        ("FONTNAME", (0, 0), (0, 0), "Helvetica-Bold"),
+        ("FONTNAME", (2, 0), (2, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 10),
+        ("ALIGN", (2, 0), (2, 0), "RIGHT"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+        ("TOPPADDING", (0, 0), (-1, -1), 8),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+    ]
+)
+
+ESTILO_RODAPE = TableStyle(
+    [
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("TOPPADDING", (0, 0), (-1, -1), 10),
+    ]
+)
+
+ESTILO_RODAPE_TEXTO = TableStyle(
+    [
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("TOPPADDING", (0, 0), (-1, -1), 2),
+    ]
+)
+
+CABECALHOS_ITENS_COM_PESO = ["Item", "Qtd", "Rep", "Peso", "Referencia", "Descricao", "Dimensoes", "Preco\nFinal"]
+LARGURAS_ITENS_COM_PESO = [1 * cm, 1.2 * cm, 1.2 * cm, 1.2 * cm, 2.5 * cm, 6 * cm, 3 * cm, 2.9 * cm]
+CABECALHOS_ITENS = ["Item", "Qtd", "Referencia", "Descricao", "Dimensoes", "Preco\nFinal"]
+LARGURAS_ITENS = [1 * cm, 1.2 * cm, 2.5 * cm, 7.5 * cm, 4 * cm, 2.8 * cm]
+
+
+@dataclass(frozen=True)
+class _Bloco:
+    flowable: Flowable
+    altura: float
+
+
+@dataclass(frozen=True)
+class _LayoutEstatico:
+    cabecalho: _Bloco
+    cliente: tuple[_Bloco, ...]
+    rodape: tuple[_Bloco, ...]
+
+    @property
+    def altura_cliente(self) -> float:
+        return sum(b.altura for b in self.cliente)
+
+    @property
+    def altura_rodape(self) -> float:
+        return sum(b.altura for b in self.rodape)
+
+
+_desenho_lock = Lock()
 
 
 def _brl(value: float) -> str:
     return f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
 
-def _create_header_table() -> Table:
-    logos_dir = Path(__file__).resolve().parent / "logos"
-    boavista = logos_dir / "BV.png"
-    quio = logos_dir / "quio.jpeg"
+def _logo(nome: str, fallback: str):
+    caminho = LOGOS_DIR / nome
+    if not caminho.exists():
+        return fallback
 
-    left = "BOA VISTA"
-    right = "QUIO"
+    imagem = Image(str(caminho))
+    imagem.drawHeight = 1.2 * cm
+    imagem.drawWidth = 3.5 * cm
+    return imagem
 
-    if boavista.exists():
-        left_image = Image(str(boavista))
-        left_image.drawHeight = 1.2 * cm
-        left_image.drawWidth = 3.5 * cm
-        left = left_image
 
-    if quio.exists():
-        right_image = Image(str(quio))
-        right_image.drawHeight = 1.2 * cm
-        right_image.drawWidth = 3.5 * cm
-        right = right_image
+def _create_header_table() -> Table:
+    left = _logo("BV.png", "BOA VISTA")
+    right = _logo("quio.jpeg", "QUIO")
 
     table = Table([[left, "", "", right]], colWidths=[7 * cm, 5 * cm, 3 * cm, 4 * cm])
-    table.setStyle(
-        TableStyle(
-            [
-                ("ALIGN", (0, 0), (0, 0), "LEFT"),
-                ("ALIGN", (3, 0), (3, 0), "RIGHT"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("LEFTPADDING", (0, 0), (0, 0), 10),
-                ("RIGHTPADDING", (3, 0), (3, 0), 10),
-                ("TOPPADDING", (0, 0), (-1, -1), 10),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-            ]
-        )
-    )
-    return table
-
-
-def _create_info_line(data_hora: str) -> Table:
-    table = Table([[f"Data: {data_hora}", "", "Orcamento"]], colWidths=[10 * cm, 5 * cm, 4 * cm])
-    table.setStyle(
-        TableStyle(
-            [
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("ALIGN", (0, 0), (0, 0), "LEFT"),
-                ("ALIGN", (2, 0), (2, 0), "RIGHT"),
-            ]
-        )
-    )
+    table.setStyle(ESTILO_CABECALHO)
     return table
 
 
 def _create_client_data_table() -> list[Table]:
     title = Table([["Dados do cliente:"]], colWidths=[19 * cm])
-    title.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#f0f0f0")),
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 11),
-                ("LEFTPADDING", (0, 0), (-1, -1), 8),
-                ("TOPPADDING", (0, 0), (-1, -1), 6),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.grey),
-            ]
-        )
-    )
+    title.setStyle(ESTILO_TITULO_CLIENTE)
 
     client = Table(
         [
@@ -95,48 +195,122 @@ def _create_client_data_table() -> list[Table]:
         ],
         colWidths=[9.5 * cm, 9.5 * cm],
     )
-    client.setStyle(
-        TableStyle(
-            [
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("LEFTPADDING", (0, 0), (-1, -1), 8),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-                ("TOPPADDING", (0, 0), (-1, -1), 4),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ]
-        )
-    )
+    client.setStyle(ESTILO_CLIENTE)
 
     return [title, client]
 
 
+def _create_footer_info() -> list[Table]:
+    footer = Table([["TABELA DE PRECOS: BOA VISTA - TABELA LOJAS OFICIAL"]], colWidths=[19 * cm])
+    footer.setStyle(ESTILO_RODAPE)
+
+    company = Table([["Razao social: | Endereco: | Telefone:"]], colWidths=[19 * cm])
+    company.setStyle(ESTILO_RODAPE_TEXTO)
+
+    copyright_table = Table([["(c) Quio. Todos os direitos reservados."]], colWidths=[19 * cm])
+    copyright_table.setStyle(ESTILO_RODAPE_TEXTO)
+
+    return [footer, company, copyright_table]
+
+
+def _preparar(flowable: Flowable) -> _Bloco:
+    _, altura = flowable.wrap(LARGURA_TABELA, ALTURA_PAGINA)
+    return _Bloco(flowable, altura)
+
+
+@lru_cache(maxsize=None)
+def _layout_estatico() -> _LayoutEstatico:
+    return _LayoutEstatico(
+        cabecalho=_preparar(_create_header_table()),
+        cliente=tuple(_preparar(t) for t in _create_client_data_table()),
+        rodape=tuple(_preparar(t) for t in _create_footer_info()),
+    )
+
+
+def _desenhar_blocos(canvas, blocos, y_topo: float) -> float:
+    for bloco in blocos:
+        y_topo -= bloco.altura
+        bloco.flowable.drawOn(canvas, X_TABELA, y_topo)
+    return y_topo
+
+
+def _desenhar_info_line(canvas, data_hora: str, y_topo: float) -> None:
+    canvas.setFont("Helvetica", 9)
+    baseline = y_topo - ALTURA_LINHA_INFO + 6
+    canvas.drawString(X_TABELA + 6, baseline, f"Data: {data_hora}")
+    canvas.drawRightString(X_TABELA + LARGURA_TABELA - 6, baseline, "Orcamento")
+
+
+def _desenhar_pagina(canvas, doc, primeira: bool) -> None:
+    layout = _layout_estatico()
+
+    canvas.saveState()
+    with _desenho_lock:
+        y = _desenhar_blocos(canvas, (layout.cabecalho,), ALTURA_PAGINA - MARGEM_SUPERIOR)
+        if primeira:
+            y -= 0.3 * cm
+            _desenhar_info_line(canvas, doc.data_hora, y)
+            y -= ALTURA_LINHA_INFO + 0.3 * cm
+            _desenhar_blocos(canvas, layout.cliente, y)
+        _desenhar_blocos(canvas, layout.rodape, MARGEM_INFERIOR + layout.altura_rodape)
+    canvas.restoreState()
+
+
+def _desenhar_primeira_pagina(canvas, doc) -> None:
+    _desenhar_pagina(canvas, doc, primeira=True)
+
+
+def _desenhar_demais_paginas(canvas, doc) -> None:
+    _desenhar_pagina(canvas, doc, primeira=False)
+
+
+def _criar_documento(destino) -> BaseDocTemplate:
+    layout = _layout_estatico()
+
+    topo_demais = ALTURA_PAGINA - MARGEM_SUPERIOR - layout.cabecalho.altura - 0.3 * cm
+    topo_primeira = topo_demais - ALTURA_LINHA_INFO - 0.3 * cm - layout.altura_cliente - 0.5 * cm
+    base = MARGEM_INFERIOR + layout.altura_rodape + 0.3 * cm
+    largura = LARGURA_PAGINA - 2 * MARGEM_LATERAL
+
+    doc = BaseDocTemplate(
+        destino,
+        pagesize=A4,
+        rightMargin=MARGEM_LATERAL,
+        leftMargin=MARGEM_LATERAL,
+        topMargin=ALTURA_PAGINA - topo_demais,
+        bottomMargin=base,
+    )
+    doc.addPageTemplates(
+        [
+            PageTemplate(
+                id="primeira",
+                frames=[Frame(MARGEM_LATERAL, base, largura, topo_primeira - base, id="corpo_primeira")],
+                onPage=_desenhar_primeira_pagina,
+                autoNextPageTemplate="demais",
+            ),
+            PageTemplate(
+                id="demais",
+                frames=[Frame(MARGEM_LATERAL, base, largura, topo_demais - base, id="corpo")],
+                onPage=_desenhar_demais_paginas,
+            ),
+        ]
+    )
+    return doc
+
+
 def _create_project_section(projeto_nome: str) -> Table:
     table = Table([[f"Projeto - {projeto_nome.upper()}"], ["- ACESSORIOS"]], colWidths=[19 * cm])
-    table.setStyle(
-        TableStyle(
-            [
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (0, 0), 11),
-                ("FONTSIZE", (0, 1), (0, 1), 9),
-                ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                ("TOPPADDING", (0, 0), (-1, -1), 2),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
-            ]
-        )
-    )
+    table.setStyle(ESTILO_PROJETO)
     return table
 
 
 def _create_items_table(items: list[dict], show_peso: bool) -> Table:
     if show_peso:
-        headers = ["Item", "Qtd", "Rep", "Peso", "Referencia", "Descricao", "Dimensoes", "Preco\nFinal"]
-        col_widths = [1 * cm, 1.2 * cm, 1.2 * cm, 1.2 * cm, 2.5 * cm, 6 * cm, 3 * cm, 2.9 * cm]
+        headers = CABECALHOS_ITENS_COM_PESO
+        col_widths = LARGURAS_ITENS_COM_PESO
     else:
-        headers = ["Item", "Qtd", "Referencia", "Descricao", "Dimensoes", "Preco\nFinal"]
-        col_widths = [1 * cm, 1.2 * cm, 2.5 * cm, 7.5 * cm, 4 * cm, 2.8 * cm]
+        headers = CABECALHOS_ITENS
+        col_widths = LARGURAS_ITENS
 
     table_data = [headers]
     for item in items:
@@ -163,27 +337,7 @@ def _create_items_table(items: list[dict], show_peso: bool) -> Table:
         table_data.append(row)
 
     table = Table(table_data, colWidths=col_widths, repeatRows=1)
-    table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e0e0e0")),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 8),
-                ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-                ("VALIGN", (0, 0), (-1, 0), "MIDDLE"),
-                ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 1), (-1, -1), 8),
-                ("ALIGN", (0, 1), (1, -1), "CENTER"),
-                ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("BOX", (0, 0), (-1, -1), 1, colors.grey),
-                ("LEFTPADDING", (0, 0), (-1, -1), 4),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 4),
-                ("TOPPADDING", (0, 0), (-1, -1), 4),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-            ]
-        )
-    )
+    table.setStyle(ESTILO_ITENS)
     return table
 
 
@@ -192,87 +346,15 @@ def _create_total_section(total_value: float) -> Table:
         [["Total final:", "=" * 60, f"R$ {_brl(total_value)}"]],
         colWidths=[2.5 * cm, 13.5 * cm, 3 * cm],
     )
-    table.setStyle(
-        TableStyle(
-            [
-                ("FONTNAME", (0, 0), (0, 0), "Helvetica-Bold"),
-                ("FONTNAME", (2, 0), (2, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 10),
-                ("ALIGN", (2, 0), (2, 0), "RIGHT"),
-                ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                ("TOPPADDING", (0, 0), (-1, -1), 8),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-            ]
-        )
-    )
+    table.setStyle(ESTILO_TOTAL)
     return table
 
 
-def _create_footer_info() -> list[Table]:
-    footer = Table([["TABELA DE PRECOS: BOA VISTA - TABELA LOJAS OFICIAL"]], colWidths=[19 * cm])
-    footer.setStyle(
-        TableStyle(
-            [
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                ("TOPPADDING", (0, 0), (-1, -1), 10),
-            ]
-        )
-    )
-
-    company = Table([["Razao social: | Endereco: | Telefone:"]], colWidths=[19 * cm])
-    company.setStyle(
-        TableStyle(
-            [
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 0), (-1, -1), 8),
-                ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                ("TOPPADDING", (0, 0), (-1, -1), 2),
-            ]
-        )
-    )
-
-    copyright_table = Table([["(c) Quio. Todos os direitos reservados."]], colWidths=[19 * cm])
-    copyright_table.setStyle(
-        TableStyle(
-            [
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 0), (-1, -1), 8),
-                ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                ("TOPPADDING", (0, 0), (-1, -1), 2),
-            ]
-        )
-    )
-
-    return [footer, company, copyright_table]
-
-
-def gerar_pdf_orcamento(moveis_configurados, session_id):
-    buffer = io.BytesIO()
-
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=1.5 * cm,
-        leftMargin=1.5 * cm,
-        topMargin=1.5 * cm,
-        bottomMargin=2 * cm,
-    )
+def escrever_pdf_orcamento(moveis_configurados, session_id, destino) -> None:
+    doc = _criar_documento(destino)
+    doc.data_hora = datetime.now().strftime("%d/%m/%Y    Hora: %H:%M:%S")
 
     elements = []
-    elements.append(_create_header_table())
-    elements.append(Spacer(1, 0.3 * cm))
-
-    data_hora = datetime.now().strftime("%d/%m/%Y    Hora: %H:%M:%S")
-    elements.append(_create_info_line(data_hora))
-    elements.append(Spacer(1, 0.3 * cm))
-
-    for table in _create_client_data_table():
-        elements.append(table)
-    elements.append(Spacer(1, 0.5 * cm))
-
     total_geral = 0.0
     for idx, config in enumerate(moveis_configurados, 1):
         elements.append(_create_project_section(config.nome_movel))
@@ -304,12 +386,13 @@ def gerar_pdf_orcamento(moveis_configurados, session_id):
         total_geral += config.total_geral()
 
     elements.append(_create_total_section(total_geral))
-    elements.append(Spacer(1, 0.5 * cm))
-
-    for table in _create_footer_info():
-        elements.append(table)
 
     doc.build(elements)
+
+
+def gerar_pdf_orcamento(moveis_configurados, session_id):
+    buffer = io.BytesIO()
+    escrever_pdf_orcamento(moveis_configurados, session_id, buffer)
     buffer.seek(0)
     return buffer
 
@@ -317,12 +400,16 @@ def gerar_pdf_orcamento(moveis_configurados, session_id):
 def salvar_pdf_local(moveis_configurados, session_id):
     Path(ORCAMENTOS_DIR).mkdir(parents=True, exist_ok=True)
 
-    buffer = gerar_pdf_orcamento(moveis_configurados, session_id)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"orcamento_{session_id}_{timestamp}.pdf"
     filepath = Path(ORCAMENTOS_DIR) / filename
 
-    with open(filepath, "wb") as output:
-        output.write(buffer.getvalue())
+    temporario = filepath.with_name(f"{filename}.{uuid.uuid4().hex}.tmp")
+    try:
+        escrever_pdf_orcamento(moveis_configurados, session_id, str(temporario))
+        os.replace(temporario, filepath)
+    finally:
+        temporario.unlink(missing_ok=True)
 
+    gravar_pdf_cache(hash_orcamento(moveis_configurados), filepath)
     return filename
@@ -1,10 +1,14 @@
-from fastapi import APIRouter
+from typing import Optional
 
-from app.features.orcamento.schemas import AtualizarComponenteRequest, EditarDimensaoRequest
+from fastapi import APIRouter, Header
+from fastapi.responses import Response
+
+from app.features.orcamento.schemas import AtualizarComponenteRequest, EditarDimensaoRequest, EditarOrcamentoRequest
 from app.features.orcamento.service import (
     atualizar_componente,
     editar_componente,
     editar_dimensao,
+    editar_orcamento,
     obter_orcamento,
     remover_movel,
 )
@@ -13,8 +17,17 @@ router = APIRouter(prefix="/orcamento", tags=["orcamento"])
 
 
 @router.get("/{session_id}")
-def get_orcamento(session_id: str) -> dict:
-    return obter_orcamento(session_id)
+def get_orcamento(
+    session_id: str,
+    since: Optional[int] = None,
+    if_none_match: Optional[str] = Header(default=None),
+) -> Response:
+    return obter_orcamento(session_id, since, if_none_match)
+
+
+@router.patch("/{session_id}")
+def patch_orcamento(session_id: str, payload: EditarOrcamentoRequest) -> dict:
+    return editar_orcamento(session_id, payload.edicoes)
 
 
 @router.delete("/{session_id}/remover/{movel_id}")
@@ -23,7 +36,7 @@ def delete_movel(session_id: str, movel_id: int) -> dict:
 
 
 @router.get("/{session_id}/editar-componente/{movel_id}/{componente_id}")
-def get_editar_componente(session_id: str, movel_id: int, componente_id: int) -> dict:
+def get_editar_componente(session_id: str, movel_id: int, componente_id: int) -> Response:
     return editar_componente(session_id, movel_id, componente_id)
 
 
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Annotated, Literal, Union
+
+from pydantic import BaseModel, Field
 
 
 class AtualizarComponenteRequest(BaseModel):
@@ -9,3 +11,30 @@ class EditarDimensaoRequest(BaseModel):
     largura: float
     altura: float
     profundidade: float
+
+
+class EdicaoDimensao(BaseModel):
+    tipo: Literal["dimensao"]
+    movel_id: int
+    largura: float
+    altura: float
+    profundidade: float
+
+
+class EdicaoComponente(BaseModel):
+    tipo: Literal["componente"]
+    movel_id: int
+    componente_id: int
+    opcao: str
+
+
+class EdicaoRemocao(BaseModel):
+    tipo: Literal["remover"]
+    movel_id: int
+
+
+EdicaoOrcamento = Annotated[Union[EdicaoDimensao, EdicaoComponente, EdicaoRemocao], Field(discriminator="tipo")]
+
+
+class EditarOrcamentoRequest(BaseModel):
+    edicoes: list[EdicaoOrcamento] = Field(min_length=1, max_length=200)
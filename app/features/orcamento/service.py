@@ -1,25 +1,44 @@
+from copy import deepcopy
+from typing import Optional
+
 from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response
 
-from app.domain.models import Componente
+from app.domain.models import Componente, ConfiguracaoMovel, Conversa
 from app.domain.states import ESTADOS
-from app.features.chat.helpers_tabbles import normalizar
-from app.features.conversations.store import get_conversa
-from app.features.orcamento.catalogo.catalogo_repository import buscar_catalogo_componentes
-
-
-CATALOGO = buscar_catalogo_componentes()
-
-
-def obter_orcamento(session_id: str) -> dict:
+from app.domain.texto import normalizar
+from app.features.conversations.store import get_conversa, sessao_conversa
+from app.features.orcamento.catalogo.catalogo_repository import (
+    buscar_catalogo_componentes,
+    buscar_opcao_componente,
+    componente_compartilhado,
+)
+from app.features.orcamento.catalogo.catalogo_respostas import json_bytes, memorizar, resposta_json
+from app.features.orcamento.schemas import EdicaoComponente, EdicaoDimensao, EdicaoOrcamento, EdicaoRemocao
+from app.shared.http import etag_corresponde
+
+
+def obter_orcamento(session_id: str, desde: Optional[int] = None, if_none_match: Optional[str] = None) -> Response:
     conversa = get_conversa(session_id)
+    revisao = conversa.revisao if conversa else 0
+
+    etag = f'"{revisao}"'
+    if etag_corresponde(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
     if not conversa:
-        return {"moveis": [], "total": 0, "finalizado": False}
+        corpo = {"moveis": [], "total": 0, "finalizado": False, "revisao": 0}
+    else:
+        corpo = _montar_orcamento(conversa, desde)
+    return JSONResponse(corpo, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
 
-    moveis = []
-    total_geral = 0.0
 
+def _montar_orcamento(conversa: Conversa, desde: Optional[int] = None) -> dict:
+    moveis = []
     for idx, config in enumerate(conversa.moveis_orcados):
+        if desde is not None and config.revisao <= desde:
+            continue
+
         componentes = [
             {
                 "nome": c.nome,
@@ -31,9 +50,6 @@ def obter_orcamento(session_id: str) -> dict:
             for c in config.componentes
         ]
 
-        total_movel = config.total_geral()
-        total_geral += total_movel
-
         moveis.append(
             {
                 "id": idx,
@@ -41,96 +57,145 @@ def obter_orcamento(session_id: str) -> dict:
                 "dimensoes": f"{int(config.L_mm)}x{int(config.A_mm)}x{int(config.P_mm)} mm",
                 "material": config.material,
                 "cor": config.cor,
-                "total": total_movel,
+                "total": config.total_geral(),
                 "componentes": componentes,
             }
         )
 
-    return {"moveis": moveis, "total": total_geral, "finalizado": conversa.estado == ESTADOS["FINALIZADO"]}
+    corpo = {
+        "moveis": moveis,
+        "total": conversa.total_orcamento(),
+        "finalizado": conversa.estado == ESTADOS["FINALIZADO"],
+        "revisao": conversa.revisao,
+    }
+    if desde is not None:
+        corpo["desde"] = desde
+        corpo["qtd_moveis"] = len(conversa.moveis_orcados)
+    return corpo
 
 
-def remover_movel(session_id: str, movel_id: int) -> dict:
-    conversa = get_conversa(session_id)
-    if not conversa:
-        raise HTTPException(status_code=404, detail="Sessao nao encontrada")
-
-    if movel_id < 0 or movel_id >= len(conversa.moveis_orcados):
+def _validar_movel(moveis: list[ConfiguracaoMovel], movel_id: int) -> ConfiguracaoMovel:
+    if movel_id < 0 or movel_id >= len(moveis):
         raise HTTPException(status_code=400, detail="Movel invalido")
+    return moveis[movel_id]
 
-    conversa.moveis_orcados.pop(movel_id)
-    return {"success": True}
 
+def _validar_componente(movel: ConfiguracaoMovel, componente_id: int) -> Componente:
+    if componente_id < 0 or componente_id >= len(movel.componentes):
+        raise HTTPException(status_code=400, detail="Componente invalido")
+    return movel.componentes[componente_id]
 
-def editar_componente(session_id: str, movel_id: int, componente_id: int) -> dict:
-    conversa = get_conversa(session_id)
-    if not conversa:
-        raise HTTPException(status_code=404, detail="Sessao nao encontrada")
 
-    if movel_id < 0 or movel_id >= len(conversa.moveis_orcados):
-        raise HTTPException(status_code=400, detail="Movel invalido")
+def _trocar_componente(movel: ConfiguracaoMovel, componente_id: int, opcao_id: str, catalogo_versao) -> None:
+    componente_antigo = _validar_componente(movel, componente_id)
+    categoria = normalizar(componente_antigo.categoria_funcional)
 
-    movel = conversa.moveis_orcados[movel_id]
+    nova_opcao = buscar_opcao_componente(categoria, opcao_id, catalogo_versao)
+    if not nova_opcao:
+        raise HTTPException(status_code=400, detail="Opcao invalida")
 
-    if componente_id < 0 or componente_id >= len(movel.componentes):
-        raise HTTPException(status_code=400, detail="Componente invalido")
+    novo = Componente(
+        nome=nova_opcao["nome"],
+        categoria_funcional=categoria,
+        quantidade=componente_antigo.quantidade,
+        preco_unitario=nova_opcao["preco_unitario"],
+    )
+    movel.componentes[componente_id] = componente_compartilhado(novo, catalogo_versao)
 
-    componente = movel.componentes[componente_id]
-    categoria = normalizar(componente.categoria_funcional)
 
-    if categoria not in CATALOGO:
-        raise HTTPException(status_code=400, detail="Categoria nao encontrada no catalogo")
+def _alterar_dimensao(movel: ConfiguracaoMovel, largura: float, altura: float, profundidade: float) -> None:
+    movel.L_mm = largura
+    movel.A_mm = altura
+    movel.P_mm = profundidade
 
-    return {"categoria": categoria, "opcoes": CATALOGO[categoria]}
 
+def remover_movel(session_id: str, movel_id: int) -> dict:
+    with sessao_conversa(session_id, criar=False) as conversa:
+        if not conversa:
+            raise HTTPException(status_code=404, detail="Sessao nao encontrada")
 
-def atualizar_componente(session_id: str, movel_id: int, componente_id: int, opcao_id: str) -> dict:
+        _validar_movel(conversa.moveis_orcados, movel_id)
+        conversa.moveis_orcados.pop(movel_id)
+        return {"success": True}
+
+
+def editar_componente(session_id: str, movel_id: int, componente_id: int) -> Response:
     conversa = get_conversa(session_id)
     if not conversa:
         raise HTTPException(status_code=404, detail="Sessao nao encontrada")
 
-    if movel_id < 0 or movel_id >= len(conversa.moveis_orcados):
-        raise HTTPException(status_code=400, detail="Movel invalido")
-
-    movel = conversa.moveis_orcados[movel_id]
-
-    if componente_id < 0 or componente_id >= len(movel.componentes):
-        raise HTTPException(status_code=400, detail="Componente invalido")
-
-    componente_antigo = movel.componentes[componente_id]
-    categoria = normalizar(componente_antigo.categoria_funcional)
-
-    opcoes = CATALOGO.get(categoria, [])
-    nova_opcao = next((o for o in opcoes if str(o["id"]) == opcao_id), None)
+    movel = _validar_movel(conversa.moveis_orcados, movel_id)
+    componente = _validar_componente(movel, componente_id)
+    categoria = normalizar(componente.categoria_funcional)
+    catalogo = buscar_catalogo_componentes(conversa.catalogo_versao)
 
-    if not nova_opcao:
-        raise HTTPException(status_code=400, detail="Opcao invalida")
+    if categoria not in catalogo:
+        raise HTTPException(status_code=400, detail="Categoria nao encontrada no catalogo")
 
-    movel.componentes.pop(componente_id)
-    movel.componentes.insert(
-        componente_id,
-        Componente(
-            nome=nova_opcao["nome"],
-            categoria_funcional=categoria,
-            quantidade=componente_antigo.quantidade,
-            preco_unitario=nova_opcao["preco_unitario"],
-        ),
+    corpo = memorizar(
+        conversa.catalogo_versao,
+        ("editar_componente", categoria),
+        lambda snapshot: json_bytes({"categoria": categoria, "opcoes": snapshot.catalogo_componentes[categoria]}),
     )
-
-    return {"success": True}
+    return resposta_json(corpo)
 
 
-def editar_dimensao(session_id: str, movel_id: int, largura: float, altura: float, profundidade: float) -> dict:
-    conversa = get_conversa(session_id)
-    if not conversa:
-        raise HTTPException(status_code=404, detail="Sessao nao encontrada")
+def atualizar_componente(session_id: str, movel_id: int, componente_id: int, opcao_id: str) -> dict:
+    with sessao_conversa(session_id, criar=False) as conversa:
+        if not conversa:
+            raise HTTPException(status_code=404, detail="Sessao nao encontrada")
 
-    if movel_id < 0 or movel_id >= len(conversa.moveis_orcados):
-        raise HTTPException(status_code=400, detail="Movel invalido")
+        movel = _validar_movel(conversa.moveis_orcados, movel_id)
+        _trocar_componente(movel, componente_id, opcao_id, conversa.catalogo_versao)
+        return {"success": True}
 
-    movel = conversa.moveis_orcados[movel_id]
-    movel.L_mm = largura
-    movel.A_mm = altura
-    movel.P_mm = profundidade
-    movel.recalcular_preco_por_area()
 
-    return {"success": True}
+def editar_dimensao(session_id: str, movel_id: int, largura: float, altura: float, profundidade: float) -> dict:
+    with sessao_conversa(session_id, criar=False) as conversa:
+        if not conversa:
+            raise HTTPException(status_code=404, detail="Sessao nao encontrada")
+
+        movel = _validar_movel(conversa.moveis_orcados, movel_id)
+        _alterar_dimensao(movel, largura, altura, profundidade)
+        movel.recalcular_preco_por_area()
+
+        return {"success": True}
+
+
+def _aplicar_edicao(
+    moveis: list[ConfiguracaoMovel],
+    edicao: EdicaoOrcamento,
+    catalogo_versao,
+    redimensionados: dict[int, ConfiguracaoMovel],
+) -> None:
+    movel = _validar_movel(moveis, edicao.movel_id)
+
+    if isinstance(edicao, EdicaoDimensao):
+        _alterar_dimensao(movel, edicao.largura, edicao.altura, edicao.profundidade)
+        redimensionados[id(movel)] = movel
+    elif isinstance(edicao, EdicaoComponente):
+        _trocar_componente(movel, edicao.componente_id, edicao.opcao, catalogo_versao)
+    elif isinstance(edicao, EdicaoRemocao):
+        moveis.pop(edicao.movel_id)
+
+
+def editar_orcamento(session_id: str, edicoes: list[EdicaoOrcamento]) -> dict:
+    with sessao_conversa(session_id, criar=False) as conversa:
+        if not conversa:
+            raise HTTPException(status_code=404, detail="Sessao nao encontrada")
+
+        moveis = [deepcopy(config) for config in conversa.moveis_orcados]
+        redimensionados: dict[int, ConfiguracaoMovel] = {}
+        for indice, edicao in enumerate(edicoes):
+            try:
+                _aplicar_edicao(moveis, edicao, conversa.catalogo_versao, redimensionados)
+            except HTTPException as exc:
+                raise HTTPException(status_code=exc.status_code, detail=f"Edicao {indice}: {exc.detail}") from exc
+
+        for movel in moveis:
+            if id(movel) in redimensionados:
+                movel.recalcular_preco_por_area()
+
+        conversa.moveis_orcados = moveis
+
+    return _montar_orcamento(conversa)
@@ -1,15 +1,23 @@
-from fastapi import APIRouter
+from typing import Optional
 
-from app.features.system.service import download_pdf, status_orcamento
+from fastapi import APIRouter, Header
+
+from app.features.system.schemas import ExportarPdfsRequest
+from app.features.system.service import download_pdf, exportar_pdfs_zip, status_orcamento
 
 router = APIRouter(tags=["system"])
 
 
 @router.get("/download-pdf/{session_id}")
-def get_download_pdf(session_id: str):
-    return download_pdf(session_id)
+def get_download_pdf(session_id: str, if_none_match: Optional[str] = Header(default=None)):
+    return download_pdf(session_id, if_none_match)
+
+
+@router.post("/download-pdf/lote")
+def post_exportar_pdfs(payload: ExportarPdfsRequest):
+    return exportar_pdfs_zip(payload.session_ids)
 
 
 @router.get("/status/{session_id}")
-def get_status_orcamento(session_id: str) -> dict:
-    return status_orcamento(session_id)
+def get_status_orcamento(session_id: str, if_none_match: Optional[str] = Header(default=None)):
+    return status_orcamento(session_id, if_none_match)
@@ -1,33 +1,142 @@
+from copy import deepcopy
+import io
+from typing import Iterator, Optional
+import zipfile
+
 from fastapi import HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 
-from app.features.conversations.store import get_conversa
-from app.features.orcamento.pdf.pdf_service import gerar_pdf_orcamento
+from app.features.conversations.store import get_conversa, sessao_conversa
+from app.features.orcamento.pdf.pdf_cache import hash_orcamento
+from app.features.orcamento.pdf.pdf_jobs import STATUS_CONCLUIDO, obter_job, renderizar_lote, renderizar_para_cache
+from app.shared.http import etag_corresponde
 
 
-def download_pdf(session_id: str) -> StreamingResponse:
-    conversa = get_conversa(session_id)
+def _copiar_moveis(session_id: str) -> Optional[list]:
+    with sessao_conversa(session_id, criar=False) as conversa:
+        if not conversa or not conversa.moveis_orcados:
+            return None
+        return deepcopy(conversa.moveis_orcados)
+
 
-    if not conversa or not conversa.moveis_orcados:
+def download_pdf(session_id: str, if_none_match: Optional[str] = None) -> Response:
+    moveis = _copiar_moveis(session_id)
+
+    if not moveis:
         raise HTTPException(status_code=404, detail="Orcamento nao encontrado")
 
+    chave = hash_orcamento(moveis)
+    # Fraco: o PDF traz a data da renderizacao, entao os bytes mudam a cada nova renderizacao.
+    etag = f'W/"{chave}"'
+    if etag_corresponde(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     try:
-        buffer = gerar_pdf_orcamento(conversa.moveis_orcados, session_id)
-        filename = f"orcamento_{session_id}.pdf"
-        headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-        return StreamingResponse(buffer, media_type="application/pdf", headers=headers)
+        caminho = renderizar_para_cache(moveis, session_id)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+    return FileResponse(
+        caminho,
+        media_type="application/pdf",
+        filename=f"orcamento_{session_id}.pdf",
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+    )
+
+
+class _SaidaZip(io.RawIOBase):
+    def __init__(self) -> None:
+        self._partes: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, dados) -> int:
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def drenar(self) -> bytes:
+        dados = b"".join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+def _gerar_zip(itens: list[tuple[str, list]], erros: dict[str, str]) -> Iterator[bytes]:
+    saida = _SaidaZip()
+    with zipfile.ZipFile(saida, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as arquivo_zip:
+        for session_id, caminho, erro in renderizar_lote(itens):
+            if erro is not None:
+                erros[session_id] = erro
+                continue
 
-def status_orcamento(session_id: str) -> dict:
+            try:
+                with open(caminho, "rb") as origem, arquivo_zip.open(f"orcamento_{session_id}.pdf", "w") as destino:
+                    for bloco in iter(lambda: origem.read(64 * 1024), b""):
+                        destino.write(bloco)
+                        yield saida.drenar()
+            except OSError as exc:
+                erros[session_id] = str(exc)
+            yield saida.drenar()
+
+        if erros:
+            arquivo_zip.writestr("erros.txt", "".join(f"{sid}: {erro}\n" for sid, erro in erros.items()))
+    yield saida.drenar()
+
+
+def exportar_pdfs_zip(session_ids: list[str]) -> StreamingResponse:
+    itens = []
+    erros = {}
+    for session_id in dict.fromkeys(session_ids):
+        try:
+            moveis = _copiar_moveis(session_id)
+        except HTTPException as exc:
+            erros[session_id] = exc.detail
+            continue
+        if not moveis:
+            erros[session_id] = "Orcamento nao encontrado"
+            continue
+        itens.append((session_id, moveis))
+
+    if not itens:
+        raise HTTPException(status_code=404, detail="Nenhum orcamento encontrado")
+
+    headers = {"Content-Disposition": 'attachment; filename="orcamentos.zip"'}
+    return StreamingResponse(_gerar_zip(itens, erros), media_type="application/zip", headers=headers)
+
+
+def status_orcamento(session_id: str, if_none_match: Optional[str] = None) -> Response:
     conversa = get_conversa(session_id)
 
     if not conversa:
         raise HTTPException(status_code=404, detail="Sessao nao encontrada")
 
-    return {
+    pdf = _status_pdf(session_id, conversa)
+    etag = f'"{conversa.revisao}"' if pdf is None else f'"{conversa.revisao}-{pdf["status"]}-{pdf["progresso"]}"'
+    if etag_corresponde(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    corpo = {
         "estado": conversa.estado,
         "qtd_moveis": len(conversa.moveis_orcados),
-        "total": sum(m.total_geral() for m in conversa.moveis_orcados) if conversa.moveis_orcados else 0,
+        "total": conversa.total_orcamento(),
+        "revisao": conversa.revisao,
+        "pdf": pdf,
     }
+    return JSONResponse(corpo, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+
+def _status_pdf(session_id: str, conversa) -> Optional[dict]:
+    if not conversa.pdf_job_id:
+        return None
+
+    job = obter_job(conversa.pdf_job_id)
+    if job is not None:
+        status = job.para_dict()
+    elif conversa.pdf_filename:
+        status = {"job_id": conversa.pdf_job_id, "status": STATUS_CONCLUIDO, "progresso": 100, "filename": conversa.pdf_filename}
+    else:
+        status = {"job_id": conversa.pdf_job_id, "status": "desconhecido", "progresso": None, "filename": None}
+
+    status["pdf_ready"] = status["status"] == STATUS_CONCLUIDO
+    status["download_url"] = f"/download-pdf/{session_id}" if status["pdf_ready"] else None
+    return status
@@ -1,17 +1,65 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.features.chat.router import router as chat_router
-from app.features.chat.voz.router import router as chat_voice_router
-from app.features.conversations.router import router as conversations_router
-from app.features.health.router import router as health_router
-from app.features.orcamento.router import router as orcamento_router
-from app.features.system.router import router as system_router
-from app.config.settings import CORS_ALLOW_ALL, CORS_ORIGINS
+from app.config.settings import (
+    AQUECER_PDF,
+    CATALOGO_RELOAD_INTERVAL,
+    CORS_ALLOW_ALL,
+    CORS_ORIGINS,
+    SESSION_SWEEP_INTERVAL,
+)
+from app.features.health.service import aguardar_aquecimento, etapa, importar, iniciar_aquecimento
+from app.features.metrics.middleware import MetricasMiddleware
+
+ROUTERS = (
+    "app.features.chat.router",
+    "app.features.chat.voz.router",
+    "app.features.orcamento.router",
+    "app.features.system.router",
+    "app.features.conversations.router",
+    "app.features.health.router",
+    "app.features.admin.router",
+    "app.features.metrics.router",
+)
+
+
+def _aquecer_catalogo() -> None:
+    catalogo = importar("app.features.orcamento.catalogo.catalogo_snapshot")
+    catalogo.obter_snapshot()
+    catalogo.iniciar_monitor_catalogo(CATALOGO_RELOAD_INTERVAL)
+
+
+def _aquecer_pdf() -> None:
+    importar("app.features.orcamento.pdf.pdf_service")._layout_estatico()
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    from app.features.chat.executor import encerrar_executor_chat
+    from app.features.conversations.store import iniciar_limpeza_sessoes, parar_limpeza_sessoes
+    from app.features.orcamento.catalogo.catalogo_snapshot import parar_monitor_catalogo
+    from app.features.orcamento.pdf.pdf_jobs import encerrar_pool_pdf
+
+    with etapa("limpeza_sessoes"):
+        iniciar_limpeza_sessoes(SESSION_SWEEP_INTERVAL)
+    passos = [("catalogo", _aquecer_catalogo)]
+    if AQUECER_PDF:
+        passos.append(("pdf", _aquecer_pdf))
+    iniciar_aquecimento(passos)
+    try:
+        yield
+    finally:
+        encerrar_executor_chat()
+        encerrar_pool_pdf()
+        parar_limpeza_sessoes()
+        aguardar_aquecimento(timeout=5)
+        parar_monitor_catalogo()
 
 
 def create_app() -> FastAPI:
-    application = FastAPI(title="Quio Solucoes API", version="1.0.0")
+    application = FastAPI(title="Quio Solucoes API", version="1.0.0", lifespan=lifespan)
 
     if CORS_ALLOW_ALL:
         application.add_middleware(
@@ -30,14 +78,14 @@ def create_app() -> FastAPI:
             allow_headers=["*"],
         )
 
-    application.include_router(chat_router)
-    application.include_router(chat_voice_router)
-    application.include_router(orcamento_router)
-    application.include_router(system_router)
-    application.include_router(conversations_router)
-    application.include_router(health_router)
+    application.add_middleware(MetricasMiddleware)
+
+    with etapa("routers"):
+        for modulo in ROUTERS:
+            application.include_router(importar(modulo).router)
 
     return application
 
 
-app = create_app()
+with etapa("create_app"):
+    app = create_app()
@@ -0,0 +1,8 @@
+from typing import Optional
+
+
+def etag_corresponde(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidatos = {c.strip().removeprefix("W/") for c in if_none_match.split(",")}
+    return "*" in candidatos or etag.removeprefix("W/") in candidatos
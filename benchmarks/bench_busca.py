@@ -0,0 +1,140 @@
+# Latencia da busca de moveis por nome (IndiceBusca.buscar) em dois catalogos
+# sinteticos: nomes variados e nomes quase iguais (todo movel tem os tokens
+# "balcao sintetico"). Falha se o p95 de alguma consulta passar do limite.
+# Uso (na raiz do repositorio):
+#   python -m benchmarks.bench_busca --moveis 5000 --limite-ms 1.0 --saida busca.json
+
+import argparse
+from datetime import datetime
+import json
+import math
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+from app.domain.models import Movel
+from app.features.orcamento.catalogo.catalogo_busca import IndiceBusca
+
+TIPOS = (
+    "Balcao", "Guarda-roupa", "Armario", "Rack", "Estante", "Painel", "Cozinha", "Gaveteiro",
+    "Aereo", "Cristaleira", "Penteadeira", "Escrivaninha",
+)
+MODIFICADORES = ("Casal", "Solteiro", "Inferior", "Superior", "Canto", "Pia", "Cooktop", "Suspenso", "Basico", "Luxo")
+CORES = ("Branco", "Preto", "Amadeirado", "Cinza", "Off White")
+CONSULTAS = {
+    "variado": (
+        "balcao",
+        "guarda roupa",
+        "guarda-roupa casal",
+        "armario cozinha branco",
+        "balcaoo",
+        "estnte",
+        "cozinha 00042",
+        "Penteadeira Inferior Off White 01234",
+        "movel que nao existe",
+    ),
+    "repetido": ("balcao", "balcao sintetico", "Balcao sintetico 00042", "balcao 4242", "sintetcio", "portas"),
+}
+
+
+def moveis_variados(quantidade: int) -> list[Movel]:
+    moveis = []
+    for i in range(1, quantidade + 1):
+        tipo = TIPOS[i % len(TIPOS)]
+        modificador = MODIFICADORES[(i // len(TIPOS)) % len(MODIFICADORES)]
+        cor = CORES[i % len(CORES)]
+        nome = f"{tipo} {modificador} {cor} {i:05d}"
+        descricao = f"{tipo} em MDF com portas e gavetas, acabamento {cor.lower()}"
+        moveis.append(Movel(i, nome, tipo.lower(), "MDF", cor, 1000.0, 800.0, 700.0, 600.0, 0.48, descricao))
+    return moveis
+
+
+def moveis_repetidos(quantidade: int) -> list[Movel]:
+    return [
+        Movel(i, f"Balcao sintetico {i:05d}", "balcao", "MDF", "Branco", 1000.0, 800.0, 700.0, 600.0, 0.56,
+              f"Movel de teste numero {i} com portas e gavetas")
+        for i in range(1, quantidade + 1)
+    ]
+
+
+CATALOGOS = {"variado": moveis_variados, "repetido": moveis_repetidos}
+
+
+def percentil(amostras: list[float], p: float) -> float:
+    ordenadas = sorted(amostras)
+    posicao = max(math.ceil(p / 100 * len(ordenadas)) - 1, 0)
+    return ordenadas[posicao]
+
+
+def _commit_atual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def medir(catalogo: str, quantidade: int, repeticoes: int) -> dict:
+    inicio = time.perf_counter()
+    indice = IndiceBusca(CATALOGOS[catalogo](quantidade))
+    montagem_ms = (time.perf_counter() - inicio) * 1000
+
+    consultas = {}
+    todas: list[float] = []
+    for consulta in CONSULTAS[catalogo]:
+        amostras = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            indice.buscar(consulta, 5)
+            amostras.append((time.perf_counter() - inicio) * 1000)
+        todas.extend(amostras)
+        melhor = indice.buscar(consulta, 1)
+        consultas[consulta] = {
+            "p50_ms": round(percentil(amostras, 50), 4),
+            "p95_ms": round(percentil(amostras, 95), 4),
+            "primeiro": melhor[0].movel.nome if melhor else None,
+        }
+
+    return {
+        "catalogo": catalogo,
+        "moveis": quantidade,
+        "montagem_ms": round(montagem_ms, 2),
+        "p50_ms": round(percentil(todas, 50), 4),
+        "p95_ms": round(percentil(todas, 95), 4),
+        "consultas": consultas,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Latencia da busca de moveis")
+    parser.add_argument("--moveis", type=int, default=5000, help="moveis no catalogo sintetico")
+    parser.add_argument("--repeticoes", type=int, default=200, help="execucoes por consulta")
+    parser.add_argument("--limite-ms", type=float, default=1.0, help="p95 maximo aceito por consulta")
+    parser.add_argument("--saida", type=Path, default=None, help="arquivo JSON de resultado")
+    args = parser.parse_args()
+
+    resultados = [medir(catalogo, args.moveis, args.repeticoes) for catalogo in CATALOGOS]
+    lentas = []
+    for resultado in resultados:
+        print(f"{resultado['catalogo']}: {resultado['moveis']} moveis, indice montado em {resultado['montagem_ms']:.1f} ms")
+        for consulta, medida in resultado["consultas"].items():
+            print(f"  {consulta!r:40} p50 {medida['p50_ms']:.3f}  p95 {medida['p95_ms']:.3f} ms  -> {medida['primeiro']}")
+            if medida["p95_ms"] > args.limite_ms:
+                lentas.append(f"{resultado['catalogo']}: {consulta}")
+        print(f"  geral: p50 {resultado['p50_ms']:.3f} ms  p95 {resultado['p95_ms']:.3f} ms  (limite {args.limite_ms} ms)\n")
+
+    if args.saida:
+        saida = {"commit": _commit_atual(), "executado_em": datetime.now().isoformat(), "resultados": resultados}
+        args.saida.write_text(json.dumps(saida, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Resultado salvo em {args.saida}")
+
+    if lentas:
+        print(f"ACIMA DO LIMITE: {', '.join(lentas)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# Mede o tempo de carga do catalogo em funcao do numero de linhas.
+# Uso (na raiz do repositorio):
+#   python -m benchmarks.bench_catalogo --moveis 1000,5000,20000 --saida catalogo.json
+#   python -m benchmarks.bench_catalogo --moveis 1000 --excel   (xlsx e catalogo compilado)
+
+import argparse
+from datetime import datetime
+import json
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from app.features.orcamento.catalogo import catalogo_snapshot
+from benchmarks.bench_chat import _commit_atual, catalogo_sintetico
+
+
+def _cronometrar(funcao, *args) -> float:
+    inicio = time.perf_counter()
+    funcao(*args)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def medir(qtd_moveis: int, componentes: int, opcoes: int, excel: bool) -> dict:
+    sheets = catalogo_sintetico(qtd_moveis, componentes, opcoes)
+    resultado = {
+        "moveis": qtd_moveis,
+        "linhas_componentes": len(sheets["componentes"]),
+        "linhas_catalogo": len(sheets["catalogo_componentes"]),
+        "moveis_ms": round(_cronometrar(catalogo_snapshot._construir_moveis, sheets["balcoes"]), 2),
+        "componentes_ms": round(_cronometrar(catalogo_snapshot._construir_componentes, sheets["componentes"]), 2),
+        "catalogo_ms": round(
+            _cronometrar(catalogo_snapshot._construir_catalogo_componentes, sheets["catalogo_componentes"]), 2
+        ),
+        "snapshot_ms": round(_cronometrar(catalogo_snapshot.construir_snapshot, sheets), 2),
+    }
+
+    if excel:
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = Path(diretorio) / "catalogo.xlsx"
+            with pd.ExcelWriter(caminho) as writer:
+                for aba, df in sheets.items():
+                    df.to_excel(writer, sheet_name=aba, index=False)
+            resultado["excel_ms"] = round(
+                _cronometrar(lambda: catalogo_snapshot.construir_snapshot(catalogo_snapshot._load_sheets(caminho))), 2
+            )
+            catalogo_snapshot.compilar_catalogo(caminho)
+            resultado["compilado_ms"] = round(_cronometrar(catalogo_snapshot.carregar_snapshot, caminho), 2)
+
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tempo de carga do catalogo")
+    parser.add_argument("--moveis", default="1000,5000,20000", help="quantidades de moveis")
+    parser.add_argument("--componentes", type=int, default=8, help="componentes por movel")
+    parser.add_argument("--opcoes", type=int, default=200, help="opcoes por categoria de componente")
+    parser.add_argument("--excel", action="store_true", help="mede tambem a leitura do arquivo xlsx")
+    parser.add_argument("--saida", type=Path, default=None, help="arquivo JSON de resultado")
+    args = parser.parse_args()
+
+    resultados = []
+    for qtd in (int(n) for n in args.moveis.split(",") if n):
+        resultado = medir(qtd, args.componentes, args.opcoes, args.excel)
+        resultados.append(resultado)
+        linha = (
+            f"{resultado['moveis']:>6} moveis / {resultado['linhas_componentes']:>7} componentes"
+            f"  moveis {resultado['moveis_ms']:>8.1f}  componentes {resultado['componentes_ms']:>8.1f}"
+            f"  catalogo {resultado['catalogo_ms']:>7.1f}  snapshot {resultado['snapshot_ms']:>8.1f} ms"
+        )
+        if "excel_ms" in resultado:
+            linha += f"  xlsx {resultado['excel_ms']:>9.1f}  compilado {resultado['compilado_ms']:>7.1f} ms"
+        print(linha)
+
+    if args.saida:
+        saida = {
+            "commit": _commit_atual(),
+            "executado_em": datetime.now().isoformat(),
+            "parametros": {"componentes": args.componentes, "opcoes": args.opcoes},
+            "resultados": resultados,
+        }
+        args.saida.write_text(json.dumps(saida, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResultado salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
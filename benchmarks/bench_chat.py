@@ -0,0 +1,242 @@
+# Benchmark da maquina de estados do chat e da geracao de PDF.
+# Uso (na raiz do repositorio, com httpx instalado):
+#   python -m benchmarks.bench_chat --moveis 500 --conversas 200 --saida resultado.json
+#   python -m benchmarks.bench_chat --comparar resultado_anterior.json
+
+import argparse
+from datetime import datetime
+import json
+import math
+import os
+from pathlib import Path
+import platform
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("CATALOGO_RELOAD_INTERVAL", "0")
+os.environ.setdefault("SESSION_SWEEP_INTERVAL", "0")
+os.environ.setdefault("SESSION_STORE", "memory")
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.domain.states import ESTADOS
+from app.features.chat.configuration_service import criar_configuracao_padrao
+from app.features.conversations.store import get_conversa
+from app.features.orcamento.catalogo.catalogo_snapshot import construir_snapshot, instalar_snapshot
+from app.features.orcamento.pdf.pdf_service import gerar_pdf_orcamento
+from app.main import app
+
+CATEGORIAS = ("porta", "gaveta", "puxador", "dobradica", "prateleira", "corredica", "pe", "tampo")
+NOMES_ESTADO = {valor: nome for nome, valor in ESTADOS.items()}
+
+
+def catalogo_sintetico(qtd_moveis: int, componentes_por_movel: int, opcoes_por_categoria: int) -> dict[str, pd.DataFrame]:
+    balcoes = pd.DataFrame(
+        {
+            "id": range(1, qtd_moveis + 1),
+            "nome": [f"Balcao sintetico {i:05d}" for i in range(1, qtd_moveis + 1)],
+            "tipo": "balcao",
+            "material": "MDF",
+            "cor": "Branco",
+            "preco_base": [f"{1000 + i:.2f}".replace(".", ",") for i in range(qtd_moveis)],
+            "l_mm": 800.0,
+            "a_mm": 700.0,
+            "p_mm": 600.0,
+            "area": 0.56,
+            "descricao": [f"Movel de teste numero {i} com portas e gavetas" for i in range(1, qtd_moveis + 1)],
+        }
+    )
+
+    componentes = pd.DataFrame(
+        [
+            {
+                "balcao_id": movel_id,
+                "nome": f"Componente {j}",
+                "categoria_funcional": CATEGORIAS[j % len(CATEGORIAS)],
+                "quantidade": 1 + j % 3,
+                "preco_unitario": f"{10 + j:.2f}",
+                "material": None,
+                "cor": None,
+            }
+            for movel_id in range(1, qtd_moveis + 1)
+            for j in range(componentes_por_movel)
+        ]
+    )
+
+    catalogo_componentes = pd.DataFrame(
+        [
+            {
+                "id": f"{categoria}-{k}",
+                "nome": f"{categoria.capitalize()} modelo {k}",
+                "categoria_funcional": categoria,
+                "preco_unitario": f"{5 + k:.2f}",
+            }
+            for categoria in CATEGORIAS
+            for k in range(opcoes_por_categoria)
+        ]
+    )
+
+    return {"balcoes": balcoes, "componentes": componentes, "catalogo_componentes": catalogo_componentes}
+
+
+def roteiro_conversa(indice: int, qtd_moveis: int) -> list[str]:
+    nome = f"Balcao sintetico {indice % qtd_moveis + 1:05d}"
+    categoria = CATEGORIAS[indice % len(CATEGORIAS)]
+    return [
+        nome,
+        "1",
+        f"{700 + indice % 300} x 700 x 600",
+        "2",
+        "preto",
+        "3",
+        "mdf",
+        "4",
+        categoria,
+        f"{categoria}-0",
+        "5",
+        "sim",
+        "finalizar",
+        "confirmar",
+    ]
+
+
+def percentil(amostras: list[float], p: float) -> float:
+    ordenadas = sorted(amostras)
+    posicao = max(math.ceil(p / 100 * len(ordenadas)) - 1, 0)
+    return ordenadas[posicao]
+
+
+def resumir(amostras: list[float]) -> dict:
+    return {
+        "n": len(amostras),
+        "p50_ms": round(percentil(amostras, 50), 3),
+        "p95_ms": round(percentil(amostras, 95), 3),
+        "p99_ms": round(percentil(amostras, 99), 3),
+        "max_ms": round(max(amostras), 3),
+    }
+
+
+def medir_chat(cliente: TestClient, qtd_conversas: int, qtd_moveis: int) -> dict:
+    por_estado: dict[str, list[float]] = {}
+
+    for i in range(qtd_conversas):
+        session_id = f"bench-{i}"
+        for mensagem in roteiro_conversa(i, qtd_moveis):
+            conversa = get_conversa(session_id)
+            estado = NOMES_ESTADO.get(conversa.estado if conversa else ESTADOS["INICIO"], "?")
+
+            inicio = time.perf_counter()
+            resposta = cliente.post("/chat", json={"message": mensagem, "session_id": session_id})
+            decorrido = (time.perf_counter() - inicio) * 1000
+
+            resposta.raise_for_status()
+            por_estado.setdefault(estado, []).append(decorrido)
+
+    todas = [t for tempos in por_estado.values() for t in tempos]
+    return {"total": resumir(todas), "por_estado": {estado: resumir(t) for estado, t in sorted(por_estado.items())}}
+
+
+def medir_pdf(snapshot, tamanhos: list[int], repeticoes: int) -> list[dict]:
+    resultados = []
+    for qtd in tamanhos:
+        moveis = [criar_configuracao_padrao(snapshot.moveis[i % len(snapshot.moveis)], snapshot.versao) for i in range(qtd)]
+        gerar_pdf_orcamento(moveis, "bench-aquecimento")
+
+        tempos = []
+        tamanho_bytes = 0
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            buffer = gerar_pdf_orcamento(moveis, "bench-pdf")
+            tempos.append((time.perf_counter() - inicio) * 1000)
+            tamanho_bytes = buffer.getbuffer().nbytes
+
+        resultados.append(
+            {
+                "moveis": qtd,
+                "componentes": sum(len(m.componentes) for m in moveis),
+                "bytes": tamanho_bytes,
+                **resumir(tempos),
+            }
+        )
+    return resultados
+
+
+def _commit_atual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def comparar(atual: dict, anterior: dict) -> None:
+    print(f"\nComparacao com {anterior.get('commit') or 'resultado anterior'}:")
+    estados_anteriores = anterior.get("chat", {}).get("por_estado", {})
+    for estado, dados in atual["chat"]["por_estado"].items():
+        base = estados_anteriores.get(estado)
+        if not base:
+            continue
+        delta = (dados["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100 if base["p95_ms"] else 0.0
+        print(f"  {estado:<32} p95 {base['p95_ms']:>8.2f} -> {dados['p95_ms']:>8.2f} ms ({delta:+.1f}%)")
+
+    pdf_anterior = {item["moveis"]: item for item in anterior.get("pdf", [])}
+    for item in atual["pdf"]:
+        base = pdf_anterior.get(item["moveis"])
+        if not base:
+            continue
+        delta = (item["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100 if base["p50_ms"] else 0.0
+        print(f"  PDF {item['moveis']:>4} moveis            p50 {base['p50_ms']:>8.2f} -> {item['p50_ms']:>8.2f} ms ({delta:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do chat e da geracao de PDF")
+    parser.add_argument("--moveis", type=int, default=200, help="moveis no catalogo sintetico")
+    parser.add_argument("--componentes", type=int, default=8, help="componentes por movel")
+    parser.add_argument("--opcoes", type=int, default=20, help="opcoes por categoria de componente")
+    parser.add_argument("--conversas", type=int, default=100, help="conversas completas reproduzidas")
+    parser.add_argument("--pdf-tamanhos", default="1,5,10,25,50", help="quantidades de moveis por PDF")
+    parser.add_argument("--pdf-repeticoes", type=int, default=5)
+    parser.add_argument("--saida", type=Path, default=None, help="arquivo JSON de resultado")
+    parser.add_argument("--comparar", type=Path, default=None, help="JSON de uma execucao anterior")
+    args = parser.parse_args()
+
+    snapshot = instalar_snapshot(construir_snapshot(catalogo_sintetico(args.moveis, args.componentes, args.opcoes)))
+
+    with TestClient(app) as cliente:
+        chat = medir_chat(cliente, args.conversas, args.moveis)
+    pdf = medir_pdf(snapshot, [int(t) for t in args.pdf_tamanhos.split(",") if t], args.pdf_repeticoes)
+
+    resultado = {
+        "commit": _commit_atual(),
+        "executado_em": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "parametros": {
+            "moveis": args.moveis,
+            "componentes": args.componentes,
+            "opcoes": args.opcoes,
+            "conversas": args.conversas,
+        },
+        "chat": chat,
+        "pdf": pdf,
+    }
+
+    print(f"Chat ({args.conversas} conversas, catalogo com {args.moveis} moveis):")
+    for estado, dados in chat["por_estado"].items():
+        print(f"  {estado:<32} p50 {dados['p50_ms']:>8.2f}  p95 {dados['p95_ms']:>8.2f}  p99 {dados['p99_ms']:>8.2f} ms")
+    print("PDF:")
+    for item in pdf:
+        print(f"  {item['moveis']:>4} moveis / {item['componentes']:>5} componentes  p50 {item['p50_ms']:>8.2f} ms  {item['bytes']} bytes")
+
+    if args.comparar:
+        comparar(resultado, json.loads(args.comparar.read_text(encoding="utf-8")))
+
+    if args.saida:
+        args.saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResultado salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# Mede a vazao de /chat com numero crescente de conexoes simultaneas.
+# Sobe um uvicorn em subprocesso e dispara conversas paralelas (uma sessao por conexao).
+# Uso (na raiz do repositorio, com httpx instalado):
+#   python -m benchmarks.bench_concorrencia --conexoes 1,4,16,64 --duracao 5
+#   python -m benchmarks.bench_concorrencia --store sqlite --saida concorrencia.json
+
+import argparse
+import asyncio
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.bench_chat import _commit_atual, resumir
+
+CICLO_MENSAGENS = ["2", "branco", "3", "mdp", "1", "800 x 700 x 600"]
+
+
+def _porta_livre() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def iniciar_servidor(porta: int, store: str, workers_chat: int, diretorio: Path) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "SESSION_STORE": store,
+        "SESSION_DB_PATH": str(diretorio / "sessoes.db"),
+        "CHAT_WORKERS": str(workers_chat),
+        "CATALOGO_RELOAD_INTERVAL": "0",
+    }
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(porta), "--log-level", "warning"],
+        env=env,
+    )
+
+    url = f"http://127.0.0.1:{porta}/health"
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        try:
+            if httpx.get(url).status_code == 200:
+                return processo
+        except httpx.TransportError:
+            time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError("Servidor nao respondeu a tempo")
+
+
+async def _conversa(cliente: httpx.AsyncClient, session_id: str, fim: float, tempos: list[float]) -> None:
+    await cliente.post("/chat", json={"message": "balcao inferior", "session_id": session_id})
+    i = 0
+    while time.monotonic() < fim:
+        mensagem = CICLO_MENSAGENS[i % len(CICLO_MENSAGENS)]
+        inicio = time.perf_counter()
+        resposta = await cliente.post("/chat", json={"message": mensagem, "session_id": session_id})
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        resposta.raise_for_status()
+        i += 1
+
+
+async def medir_nivel(base_url: str, conexoes: int, duracao: float, rodada: int) -> dict:
+    limites = httpx.Limits(max_connections=conexoes, max_keepalive_connections=conexoes)
+    tempos: list[float] = []
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limites, timeout=60) as cliente:
+        inicio = time.monotonic()
+        fim = inicio + duracao
+        await asyncio.gather(*(_conversa(cliente, f"conc-{rodada}-{i}", fim, tempos) for i in range(conexoes)))
+        decorrido = time.monotonic() - inicio
+
+    return {"conexoes": conexoes, "requisicoes": len(tempos), "req_por_s": round(len(tempos) / decorrido, 1), **resumir(tempos)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vazao de /chat por numero de conexoes")
+    parser.add_argument("--conexoes", default="1,2,4,8,16,32", help="niveis de concorrencia")
+    parser.add_argument("--duracao", type=float, default=5.0, help="segundos por nivel")
+    parser.add_argument("--store", default="memory", choices=["memory", "sqlite"])
+    parser.add_argument("--workers-chat", type=int, default=16, help="valor de CHAT_WORKERS no servidor")
+    parser.add_argument("--saida", type=Path, default=None, help="arquivo JSON de resultado")
+    args = parser.parse_args()
+
+    porta = _porta_livre()
+    with tempfile.TemporaryDirectory() as diretorio:
+        processo = iniciar_servidor(porta, args.store, args.workers_chat, Path(diretorio))
+        try:
+            niveis = [
+                asyncio.run(medir_nivel(f"http://127.0.0.1:{porta}", int(n), args.duracao, rodada))
+                for rodada, n in enumerate(args.conexoes.split(","))
+            ]
+        finally:
+            processo.terminate()
+            processo.wait(timeout=10)
+
+    print(f"/chat com store={args.store}, CHAT_WORKERS={args.workers_chat}:")
+    for nivel in niveis:
+        print(
+            f"  {nivel['conexoes']:>4} conexoes  {nivel['req_por_s']:>8.1f} req/s"
+            f"  p50 {nivel['p50_ms']:>7.2f}  p95 {nivel['p95_ms']:>7.2f} ms"
+        )
+
+    if args.saida:
+        resultado = {
+            "commit": _commit_atual(),
+            "executado_em": datetime.now().isoformat(),
+            "parametros": {"store": args.store, "workers_chat": args.workers_chat, "duracao": args.duracao},
+            "niveis": niveis,
+        }
+        args.saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResultado salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
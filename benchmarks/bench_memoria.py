@@ -0,0 +1,120 @@
+# Mede a memoria ocupada por sessao de conversa.
+# Cada sessao tem dois moveis configurados (um componente trocado pelo chat) e
+# e medida direto na memoria e apos um ciclo serializar/desserializar (backend sqlite).
+# Conta apenas objetos que nao sao alcancaveis a partir do catalogo ou dos modulos.
+# Uso (na raiz do repositorio):
+#   python -m benchmarks.bench_memoria --sessoes 10000,100000 --saida memoria.json
+
+import argparse
+from datetime import datetime
+import gc
+import json
+import os
+from pathlib import Path
+import sys
+
+os.environ.setdefault("CATALOGO_RELOAD_INTERVAL", "0")
+
+from app.domain.models import Conversa
+from app.features.chat.configuration_service import criar_configuracao_padrao
+from app.features.chat.service import Mensagem, despachar
+from app.features.conversations.serializacao import desserializar_conversa, serializar_conversa
+from app.features.orcamento.catalogo.catalogo_snapshot import construir_snapshot, instalar_snapshot
+from benchmarks.bench_chat import CATEGORIAS, _commit_atual, catalogo_sintetico
+
+MOVEIS_POR_SESSAO = 2
+
+
+def criar_sessao(snapshot, indice: int) -> Conversa:
+    conversa = Conversa()
+    conversa.catalogo_versao = snapshot.versao
+    for j in range(MOVEIS_POR_SESSAO):
+        movel = snapshot.moveis[(indice + j) % len(snapshot.moveis)]
+        conversa.configuracao = criar_configuracao_padrao(movel, snapshot.versao)
+        conversa.estado = "CONFIGURANDO_MOVEL"
+        categoria = CATEGORIAS[(indice + j) % len(CATEGORIAS)]
+        for texto in ("4", categoria, f"{categoria}-{indice % 3}", "5", "sim"):
+            despachar(conversa, Mensagem(texto, f"mem-{indice}"))
+    return conversa
+
+
+def _alcancaveis(raiz) -> set[int]:
+    vistos = set()
+    pendentes = [raiz]
+    while pendentes:
+        obj = pendentes.pop()
+        if id(obj) in vistos or isinstance(obj, type):
+            continue
+        vistos.add(id(obj))
+        pendentes.extend(gc.get_referents(obj))
+    return vistos
+
+
+def tamanho_exclusivo(raiz, compartilhados: set[int]) -> int:
+    vistos = set(compartilhados)
+    total = 0
+    pendentes = [raiz]
+    while pendentes:
+        obj = pendentes.pop()
+        if id(obj) in vistos or isinstance(obj, type):
+            continue
+        vistos.add(id(obj))
+        total += sys.getsizeof(obj)
+        pendentes.extend(gc.get_referents(obj))
+    return total
+
+
+def medir(qtd_sessoes: int, snapshot, desserializar: bool) -> dict:
+    sessoes = {}
+    for i in range(qtd_sessoes):
+        conversa = criar_sessao(snapshot, i)
+        if desserializar:
+            conversa = desserializar_conversa(serializar_conversa(conversa))
+        sessoes[f"mem-{i}"] = conversa
+
+    compartilhados = _alcancaveis(snapshot) | _alcancaveis(sys.modules)
+    total = tamanho_exclusivo(list(sessoes.values()), compartilhados)
+    del sessoes
+    return {
+        "sessoes": qtd_sessoes,
+        "origem": "desserializada" if desserializar else "memoria",
+        "bytes_total": total,
+        "bytes_por_sessao": round(total / qtd_sessoes, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memoria por sessao de conversa")
+    parser.add_argument("--sessoes", default="10000,100000", help="quantidades de sessoes")
+    parser.add_argument("--moveis", type=int, default=200, help="moveis no catalogo sintetico")
+    parser.add_argument("--componentes", type=int, default=8, help="componentes por movel")
+    parser.add_argument("--saida", type=Path, default=None, help="arquivo JSON de resultado")
+    args = parser.parse_args()
+
+    snapshot = instalar_snapshot(construir_snapshot(catalogo_sintetico(args.moveis, args.componentes, 20)))
+
+    resultados = []
+    for qtd in (int(n) for n in args.sessoes.split(",") if n):
+        for desserializar in (False, True):
+            resultado = medir(qtd, snapshot, desserializar)
+            resultados.append(resultado)
+            print(
+                f"{resultado['sessoes']:>7} sessoes ({resultado['origem']:<14})"
+                f"  {resultado['bytes_por_sessao']:>9.1f} bytes/sessao"
+                f"  {resultado['bytes_total'] / 1024 / 1024:>8.1f} MiB"
+            )
+
+    if args.saida:
+        saida = {
+            "commit": _commit_atual(),
+            "executado_em": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "parametros": {"moveis": args.moveis, "componentes": args.componentes},
+            "resultados": resultados,
+        }
+        args.saida.write_text(json.dumps(saida, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResultado salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
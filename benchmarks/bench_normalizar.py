@@ -0,0 +1,89 @@
+# Compara a normalizacao de texto atual com a implementacao original
+# (NFD + unicodedata.category por caractere).
+# Uso (na raiz do repositorio):
+#   python -m benchmarks.bench_normalizar --textos 20000 --saida normalizar.json
+
+import argparse
+from datetime import datetime
+import json
+from pathlib import Path
+import sys
+import time
+import unicodedata
+
+from app.domain.texto import normalizar
+from benchmarks.bench_chat import _commit_atual
+
+PALAVRAS = (
+    "Balcão", "Gaveteiro", "Cozinha", "Dobradiça", "Puxador", "Prateleira", "Corrediça", "Portas",
+    "Aéreo", "Tampo", "Pé", "Área", "Alumínio", "Branco", "Preto", "Amadeirado", "Suíte", "Maçaneta",
+)
+
+
+def normalizar_original(txt: str) -> str:
+    txt = txt.lower().strip()
+    txt = unicodedata.normalize("NFD", txt)
+    txt = "".join(c for c in txt if unicodedata.category(c) != "Mn")
+    if txt.endswith("s"):
+        txt = txt[:-1]
+    return txt
+
+
+def textos_sinteticos(quantidade: int) -> list[str]:
+    return [
+        f" {PALAVRAS[i % len(PALAVRAS)]} {PALAVRAS[(i * 7) % len(PALAVRAS)]} {i:05d} MDF Portas "
+        for i in range(quantidade)
+    ]
+
+
+def _cronometrar(funcao, textos: list[str]) -> float:
+    inicio = time.perf_counter()
+    for texto in textos:
+        funcao(texto)
+    return (time.perf_counter() - inicio) / len(textos) * 1_000_000
+
+
+def medir(quantidade: int) -> dict:
+    textos = textos_sinteticos(quantidade)
+    amostra_unicode = [chr(c) for c in range(0x00A0, 0x0500)] + ["Ǆ", "ﬁ", "Ἀθῆναι", "한국어", "😀s"]
+    divergentes = [t for t in textos + amostra_unicode if normalizar(t) != normalizar_original(t)]
+
+    normalizar.cache_clear()
+    sem_cache = _cronometrar(normalizar.__wrapped__, textos)
+    frio = _cronometrar(normalizar, textos)
+    quente = _cronometrar(normalizar, textos)
+    original = _cronometrar(normalizar_original, textos)
+
+    return {
+        "textos": quantidade,
+        "divergencias": len(divergentes),
+        "original_us": round(original, 3),
+        "tabela_us": round(sem_cache, 3),
+        "cache_frio_us": round(frio, 3),
+        "cache_quente_us": round(quente, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark de normalizar")
+    parser.add_argument("--textos", type=int, default=5000, help="textos distintos (acima do cache: sem acertos)")
+    parser.add_argument("--saida", type=Path, default=None, help="arquivo JSON de resultado")
+    args = parser.parse_args()
+
+    resultado = medir(args.textos)
+    print(
+        f"{resultado['textos']} textos  original {resultado['original_us']:.2f} us"
+        f"  tabela {resultado['tabela_us']:.2f} us"
+        f"  cache frio {resultado['cache_frio_us']:.2f} us"
+        f"  cache quente {resultado['cache_quente_us']:.2f} us"
+        f"  divergencias {resultado['divergencias']}"
+    )
+
+    if args.saida:
+        saida = {"commit": _commit_atual(), "executado_em": datetime.now().isoformat(), "resultado": resultado}
+        args.saida.write_text(json.dumps(saida, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResultado salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
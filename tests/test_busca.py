@@ -0,0 +1,26 @@
+import time
+
+from app.features.orcamento.catalogo.catalogo_busca import IndiceBusca
+from benchmarks.bench_busca import moveis_repetidos, moveis_variados, percentil
+
+
+def test_busca_encontra_nome_exato_e_tolera_erro_de_digitacao():
+    indice = IndiceBusca(moveis_variados(5000))
+
+    exato = indice.buscar("Penteadeira Inferior Off White 01234", 3)
+    assert exato[0].exato and exato[0].movel.id == 1234
+
+    assert indice.buscar("estnte", 1)[0].movel.nome.startswith("Estante")
+    assert indice.buscar("movel que nao existe") == []
+
+
+def test_busca_fica_abaixo_de_um_milissegundo_com_nomes_repetidos():
+    indice = IndiceBusca(moveis_repetidos(5000))
+    assert indice.buscar("balcao 4242", 1)[0].movel.id == 4242
+
+    amostras = []
+    for consulta in ("balcao", "balcao sintetico", "Balcao sintetico 00042", "sintetcio") * 50:
+        inicio = time.perf_counter()
+        indice.buscar(consulta, 5)
+        amostras.append(time.perf_counter() - inicio)
+    assert percentil(amostras, 95) < 0.001
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+from app.config.settings import CHAT_WORKERS
+from app.features.chat import service
+
+PASSO = 0.1
+
+
+def _despachar_lento(conversa, mensagem):
+    time.sleep(PASSO)
+    return {"response": "ok"}
+
+
+async def _cronometrar(session_id: str) -> float:
+    inicio = time.perf_counter()
+    await service.processar_mensagem_async("oi", session_id)
+    return time.perf_counter() - inicio
+
+
+def test_sessoes_diferentes_sao_atendidas_em_paralelo(monkeypatch):
+    monkeypatch.setattr(service, "despachar", _despachar_lento)
+
+    async def cenario() -> tuple[float, float]:
+        sozinha = await _cronometrar("conc-unica")
+        inicio = time.perf_counter()
+        await asyncio.gather(*(_cronometrar(f"conc-{i}") for i in range(4)))
+        return sozinha, time.perf_counter() - inicio
+
+    sozinha, quatro = asyncio.run(cenario())
+    assert quatro < 4 * sozinha / 2
+
+
+def test_fila_de_uma_sessao_nao_ocupa_o_pool_do_chat(monkeypatch):
+    monkeypatch.setattr(service, "despachar", _despachar_lento)
+
+    async def cenario() -> float:
+        fila = [asyncio.create_task(_cronometrar("conc-fila")) for _ in range(CHAT_WORKERS + 4)]
+        await asyncio.sleep(PASSO / 2)
+        outra = await _cronometrar("conc-outra")
+        await asyncio.gather(*fila)
+        return outra
+
+    assert asyncio.run(cenario()) < 3 * PASSO
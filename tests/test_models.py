@@ -0,0 +1,75 @@
+import math
+
+from app.domain.models import Componente, ConfiguracaoMovel, Conversa, Movel
+
+
+def _movel() -> Movel:
+    return Movel(1, "Balcao", "balcao", "MDP", "BRA", 1000.0, 800.0, 700.0, 500.0, 0.4, "")
+
+
+def _componente(nome: str, categoria: str, preco: float) -> Componente:
+    return Componente(nome=nome, categoria_funcional=categoria, quantidade=1, preco_unitario=preco)
+
+
+def test_ordenar_componentes_com_chave_mantem_total_e_indice():
+    config = ConfiguracaoMovel(_movel())
+    config.componentes = [
+        _componente("Puxador", "puxador", 30.0),
+        _componente("Dobradica", "dobradiça", 10.0),
+        _componente("Prateleira", "prateleira", 20.0),
+    ]
+
+    config.componentes.sort(key=lambda c: c.preco_unitario)
+    assert [c.nome for c in config.componentes] == ["Dobradica", "Prateleira", "Puxador"]
+    assert config.componentes.posicoes_categoria("puxador") == (2,)
+
+    config.componentes.sort(key=lambda c: c.nome, reverse=True)
+    assert [c.nome for c in config.componentes] == ["Puxador", "Prateleira", "Dobradica"]
+    assert config.componentes.posicoes_categoria("dobradica") == (2,)
+    assert config.total_componentes() == 60.0
+
+
+def test_total_do_orcamento_acompanha_alteracoes_dos_moveis():
+    conversa = Conversa()
+    primeiro, segundo = ConfiguracaoMovel(_movel()), ConfiguracaoMovel(_movel())
+    conversa.moveis_orcados.extend([primeiro, segundo])
+    assert conversa.total_orcamento() == 2000.0
+
+    primeiro.componentes.append(_componente("Puxador", "puxador", 30.0))
+    segundo.preco_atual = 1500.0
+    assert conversa.total_orcamento() == 2530.0
+
+    conversa.moveis_orcados.pop(0)
+    primeiro.preco_atual = 0.0
+    assert conversa.total_orcamento() == 1500.0
+    assert primeiro._lista is None
+
+
+def test_revisao_so_avanca_quando_a_conversa_muda():
+    conversa = Conversa()
+    assert conversa.registrar_revisao()
+    revisao = conversa.revisao
+
+    conversa.estado = conversa.estado
+    assert not conversa.registrar_revisao()
+    assert conversa.revisao == revisao
+
+    conversa.moveis_orcados.append(ConfiguracaoMovel(_movel()))
+    assert conversa.registrar_revisao()
+    assert conversa.revisao > revisao
+    assert conversa.moveis_orcados[0].revisao == conversa.revisao
+
+
+def test_total_do_orcamento_nao_acumula_erro_de_arredondamento():
+    conversa = Conversa()
+    moveis = [ConfiguracaoMovel(_movel()) for _ in range(3)]
+    conversa.moveis_orcados.extend(moveis)
+    for i in range(200):
+        movel = moveis[i % 3]
+        movel.preco_atual = 1000.0 + i * 0.1
+        movel.componentes.append(_componente("Puxador", "puxador", 0.7 + i * 0.01))
+        if i % 7 == 0:
+            movel.componentes.pop(0)
+
+    esperado = math.fsum(m.preco_atual + math.fsum(c.total() for c in m.componentes) for m in moveis)
+    assert conversa.total_orcamento() == esperado